@@ -0,0 +1,104 @@
+"""Benchmark de la API de consultas diferidas frente a las mismas operaciones en pandas.
+
+Cada consulta se ejecuta con `Consulta` y con una implementación directa en pandas que
+sirve de referencia; además de comparar los tiempos se comprueba que ambas devuelvan las
+mismas filas, incluidas las expansiones encadenadas de varias columnas multivalor.
+
+Uso:
+    pdm run python benchmarks/bench_consulta.py [cantidad ...]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/analisis")))
+
+from consulta import Consulta
+from data_frame import datos_series_a_dataframe, limpiar_dataframe
+from datos_sinteticos import generar_series
+
+CANTIDADES = (10_000, 100_000)
+
+
+def explotar(df: pd.DataFrame, columna: str) -> pd.DataFrame:
+    """Expande una columna multivalor con `str.split` + `explode`."""
+    return (
+        df.assign(**{columna: df[columna].str.split(",")})
+        .explode(columna)
+        .assign(**{columna: lambda d: d[columna].str.strip()})
+    )
+
+
+def consultas(df: pd.DataFrame) -> dict:
+    """Consultas a comparar: nombre -> (consulta diferida, referencia en pandas)."""
+    return {
+        "explotar + agrupar": (
+            lambda: Consulta(df)
+            .explotar("generos")
+            .agrupar("generos", promedio=("puntuacion", "mean"))
+            .ejecutar(),
+            lambda: explotar(df, "generos")
+            .groupby("generos")
+            .agg(promedio=("puntuacion", "mean"))
+            .reset_index(),
+        ),
+        "explotar x2": (
+            lambda: Consulta(df).explotar("generos").explotar("donde_ver").ejecutar(),
+            lambda: explotar(explotar(df, "generos"), "donde_ver"),
+        ),
+        "explotar + contiene": (
+            lambda: Consulta(df)
+            .explotar("generos")
+            .filtrar("generos", "contiene", "Drama")
+            .ejecutar(),
+            lambda: explotar(df, "generos").query("generos == 'Drama'"),
+        ),
+        "filtrar + explotar x2 + agrupar": (
+            lambda: Consulta(df)
+            .filtrar("puntuacion", ">=", 3)
+            .explotar("generos")
+            .explotar("donde_ver")
+            .agrupar("generos", "donde_ver", cantidad=("link", "count"))
+            .ejecutar(),
+            lambda: explotar(explotar(df[df["puntuacion"] >= 3], "generos"), "donde_ver")
+            .groupby(["generos", "donde_ver"])
+            .agg(cantidad=("link", "count"))
+            .reset_index(),
+        ),
+    }
+
+
+def normalizar(df: pd.DataFrame) -> pd.DataFrame:
+    """Ordena filas y columnas y pasa los valores a tipos comparables."""
+    df = df[sorted(df.columns)].astype(object).where(df.notna(), None)
+    return df.sort_values(list(df.columns), key=lambda c: c.astype(str)).reset_index(drop=True)
+
+
+def cronometrar(funcion):
+    """Devuelve el resultado de `funcion()` y los segundos que tardó."""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    """Mide cada consulta para cada tamaño de dataset y comprueba su resultado."""
+    cantidades = [int(c) for c in sys.argv[1:]] or CANTIDADES
+    for cantidad in cantidades:
+        df = limpiar_dataframe(datos_series_a_dataframe(generar_series(cantidad)))
+        for nombre, (diferida, referencia) in consultas(df).items():
+            resultado, t_consulta = cronometrar(diferida)
+            esperado, t_pandas = cronometrar(referencia)
+            pd.testing.assert_frame_equal(normalizar(resultado), normalizar(esperado))
+            print(
+                f"{cantidad:>9} series, {nombre:<32} {len(resultado):>9} filas: "
+                f"Consulta {t_consulta:.3f} s, pandas {t_pandas:.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark de la construcción y limpieza del DataFrame de series.
+
+Compara la construcción fila a fila con `DatosSerie.to_dict` frente a la construcción por
+columnas de `datos_series_a_dataframe`, y mide `limpiar_dataframe`.
+
+Uso:
+    pdm run python benchmarks/bench_dataframe.py [cantidad ...]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+from data_frame import datos_series_a_dataframe, limpiar_dataframe
+from datos_sinteticos import generar_series
+
+CANTIDADES = (10_000, 100_000, 1_000_000)
+
+
+def cronometrar(funcion, *args):
+    """Devuelve el resultado de `funcion(*args)` y los segundos que tardó."""
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    """Mide cada etapa para cada tamaño de dataset."""
+    cantidades = [int(c) for c in sys.argv[1:]] or CANTIDADES
+    for cantidad in cantidades:
+        series = generar_series(cantidad)
+
+        df_filas, t_filas = cronometrar(lambda: pd.DataFrame([s.to_dict() for s in series]))
+        df, t_columnas = cronometrar(datos_series_a_dataframe, series)
+        df, t_limpieza = cronometrar(limpiar_dataframe, df)
+        pd.testing.assert_frame_equal(limpiar_dataframe(df_filas), df)
+
+        print(
+            f"{cantidad:>9} series: to_dict {t_filas:.3f} s, "
+            f"por columnas {t_columnas:.3f} s ({t_filas / t_columnas:.1f}x), "
+            f"limpieza {t_limpieza:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
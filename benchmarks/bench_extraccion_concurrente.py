@@ -0,0 +1,55 @@
+"""Benchmark de la extracción de datos de series secuencial frente a concurrente.
+
+Uso:
+    pdm run python benchmarks/bench_extraccion_concurrente.py
+"""
+
+import dataclasses
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+import const
+
+# Se mide el motor de extracción, no el límite de cortesía ni la caché en disco
+const.settings = dataclasses.replace(
+    const.settings, peticiones_por_segundo=0, usar_cache_http=False
+)
+
+from datos_serie import DatosSerie
+from extraer_datos import extraer_datos_de_series
+from servidor_stub import iniciar_servidor
+
+CANTIDAD_SERIES = 200
+LATENCIA = 0.05
+
+
+def medir(base_url: str, max_workers: int) -> float:
+    """Devuelve los segundos que tarda en extraer `CANTIDAD_SERIES` series."""
+    series = [DatosSerie(link=f"{base_url}series/{i}") for i in range(CANTIDAD_SERIES)]
+    inicio = time.perf_counter()
+    extraer_datos_de_series(series, max_workers=max_workers)
+    duracion = time.perf_counter() - inicio
+    assert all(s.fecha_extraccion is not None for s in series)
+    return duracion
+
+
+def main():
+    """Ejecuta el benchmark para varias cantidades de hilos y muestra el speedup."""
+    logging.disable(logging.CRITICAL)
+    servidor, base_url = iniciar_servidor(latencia=LATENCIA)
+    try:
+        secuencial = medir(base_url, max_workers=1)
+        print(f"workers=1: {secuencial:.2f}s")
+        for workers in (4, 8, 16):
+            duracion = medir(base_url, max_workers=workers)
+            print(f"workers={workers}: {duracion:.2f}s (speedup x{secuencial / duracion:.1f})")
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark de la memoria que ocupan las series extraídas mientras dura un crawl.
+
+Compara `DatosSerie` (con `__slots__` y tuplas internadas) con la representación anterior,
+un dataclass común con listas propias en cada serie, construida a partir de los mismos
+datos sintéticos.
+
+Uso:
+    pdm run python benchmarks/bench_memoria_series.py [cantidad]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+from data_frame import LoteSeries
+from datos_serie import DatosSerie
+from datos_sinteticos import generar_series
+
+CANTIDAD = 100_000
+
+
+@dataclass
+class DatosSerieSinOptimizar:
+    """Representación anterior de una serie: con `__dict__` y una lista por serie."""
+
+    link: str
+    titulo: Optional[str] = None
+    titulo_original: Optional[str] = None
+    generos: Optional[list[str]] = field(default_factory=list)
+    cantidad_temporadas: Optional[int] = None
+    cantidad_episodios_totales: Optional[int] = None
+    fecha_emision_original: Optional[int] = None
+    fecha_emision_ultima: Optional[int] = None
+    puntuacion: Optional[float] = None
+    donde_ver: Optional[list[str]] = field(default_factory=list)
+    fecha_extraccion: Optional[float] = None
+
+
+def sin_optimizar(serie: DatosSerie) -> DatosSerieSinOptimizar:
+    """Copia una serie a la representación anterior, con listas nuevas como el extractor."""
+    valores = {campo.name: getattr(serie, campo.name) for campo in fields(serie)}
+    valores["generos"] = list(serie.generos)
+    valores["donde_ver"] = list(serie.donde_ver)
+    return DatosSerieSinOptimizar(**valores)
+
+
+def medir(construir) -> tuple[object, int]:
+    """Devuelve lo construido y los bytes que siguen reservados después de construirlo."""
+    gc.collect()
+    tracemalloc.start()
+    resultado = construir()
+    gc.collect()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, memoria
+
+
+def main():
+    """Mide la memoria de las series antes y después de optimizar, en lote y en DataFrame."""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else CANTIDAD
+
+    series, memoria_series = medir(lambda: generar_series(cantidad))
+    lote, memoria_lote = medir(lambda: LoteSeries(series))
+    _, memoria_df = medir(lambda: lote.a_dataframe())
+    # Las series sintéticas intermedias se liberan: solo quedan las copias y sus strings
+    _, memoria_anterior = medir(
+        lambda: [sin_optimizar(serie) for serie in generar_series(cantidad)]
+    )
+
+    print(
+        f"{cantidad} series: antes {memoria_anterior / 2**20:.1f} MiB "
+        f"({memoria_anterior / cantidad:.0f} B/serie), "
+        f"ahora {memoria_series / 2**20:.1f} MiB "
+        f"({memoria_series / cantidad:.0f} B/serie), "
+        f"lote columnar {memoria_lote / 2**20:.1f} MiB (sin contar los valores compartidos), "
+        f"DataFrame {memoria_df / 2**20:.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
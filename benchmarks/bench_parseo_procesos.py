@@ -0,0 +1,64 @@
+"""Benchmark de la extracción de series parseando en los hilos de descarga o en procesos.
+
+Uso:
+    pdm run python benchmarks/bench_parseo_procesos.py
+"""
+
+import dataclasses
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+import const
+
+# Se mide el motor de extracción, no el límite de cortesía ni la caché en disco
+const.settings = dataclasses.replace(
+    const.settings, peticiones_por_segundo=0, usar_cache_http=False
+)
+
+import pool_parseo
+from datos_serie import DatosSerie
+from extraer_datos import extraer_datos_de_series
+from servidor_stub import iniciar_servidor
+
+CANTIDAD_SERIES = 400
+MAX_WORKERS = 16
+LATENCIA = 0.01
+
+
+def medir(base_url: str, procesos: int) -> float:
+    """Devuelve los segundos que tarda en extraer `CANTIDAD_SERIES` series con `procesos`."""
+    pool_parseo.settings = dataclasses.replace(const.settings, procesos_parseo=procesos)
+    # El arranque de los procesos no forma parte de la medición
+    if (pool := pool_parseo.obtener_pool_parseo()) is not None:
+        list(pool.map(abs, range(procesos)))
+
+    series = [DatosSerie(link=f"{base_url}series/{i}") for i in range(CANTIDAD_SERIES)]
+    inicio = time.perf_counter()
+    extraer_datos_de_series(series, max_workers=MAX_WORKERS)
+    duracion = time.perf_counter() - inicio
+    pool_parseo.cerrar_pool_parseo()
+    assert all(s.fecha_extraccion is not None for s in series)
+    return duracion
+
+
+def main():
+    """Ejecuta el benchmark sin pool y con pools de distinto tamaño."""
+    logging.disable(logging.CRITICAL)
+    servidor, base_url = iniciar_servidor(latencia=LATENCIA)
+    try:
+        en_hilos = medir(base_url, procesos=0)
+        print(f"{os.cpu_count()} núcleos")
+        print(f"parseo en hilos: {en_hilos:.2f}s")
+        for procesos in sorted({1, 2, 4, os.cpu_count() or 1}):
+            duracion = medir(base_url, procesos=procesos)
+            print(f"procesos={procesos}: {duracion:.2f}s (speedup x{en_hilos / duracion:.1f})")
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
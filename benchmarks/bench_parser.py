@@ -0,0 +1,56 @@
+"""Micro-benchmark de parseo + extracción por página para cada backend HTML disponible.
+
+Uso:
+    pdm run python benchmarks/bench_parser.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+from datos_serie import DatosSerie
+from extraer_datos import ESTRUCTURA_DETALLE, completar_datos_desde_soup
+from parser_html import parsear_html, resolver_parser
+from request import buscar_links_de_series
+from servidor_stub import leer_fixture
+
+PARSERS = ("html.parser", "lxml")
+REPETICIONES = 50
+
+
+def main():
+    """Mide el tiempo medio de parseo + extracción de las páginas de serie y de listado."""
+    pagina_serie = leer_fixture("serie.html")
+    pagina_listado = leer_fixture("listado.html")
+
+    for parser in PARSERS:
+        if resolver_parser(parser) != parser:
+            print(f"{parser}: no instalado")
+            continue
+
+        def serie():
+            completar_datos_desde_soup(DatosSerie(link=""), parsear_html(pagina_serie, parser))
+
+        def serie_filtrada():
+            completar_datos_desde_soup(
+                DatosSerie(link=""),
+                parsear_html(pagina_serie, parser, parse_only=ESTRUCTURA_DETALLE),
+            )
+
+        def listado():
+            buscar_links_de_series(parsear_html(pagina_listado, parser))
+
+        t_serie = timeit.timeit(serie, number=REPETICIONES) / REPETICIONES
+        t_filtrada = timeit.timeit(serie_filtrada, number=REPETICIONES) / REPETICIONES
+        t_listado = timeit.timeit(listado, number=REPETICIONES) / REPETICIONES
+        print(
+            f"{parser}: serie {t_serie * 1000:.2f} ms/página, "
+            f"serie filtrada {t_filtrada * 1000:.2f} ms/página, "
+            f"listado {t_listado * 1000:.2f} ms/página"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Generación de datasets sintéticos de series para los benchmarks."""
+
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+
+from datos_serie import DatosSerie
+
+GENEROS = (
+    "Drama",
+    "Comedia",
+    "Animación",
+    "Acción",
+    "Suspense",
+    "Fantasía",
+    "Policíaca",
+    "Documental",
+    "Ciencia ficción",
+    "Romance",
+)
+PLATAFORMAS = ("Netflix", "HBO Max", "Disney+", "Prime Video", "Movistar Plus+", "Apple TV+")
+
+
+def generar_series(cantidad: int, semilla: int = 0) -> list[DatosSerie]:
+    """
+    Genera `cantidad` series con valores plausibles, incluyendo campos faltantes.
+
+    Con la misma semilla se obtiene siempre el mismo dataset.
+    """
+    aleatorio = random.Random(semilla)
+    series = []
+    for i in range(cantidad):
+        inicio = aleatorio.choice((None, *range(1970, 2026)))
+        fin = (
+            None
+            if inicio is None or aleatorio.random() < 0.3
+            else min(2025, inicio + aleatorio.randint(0, 12))
+        )
+        series.append(
+            DatosSerie(
+                link=f"https://www.sensacine.com/series/serie-{i}/",
+                titulo=f"Serie {i}",
+                titulo_original=None if aleatorio.random() < 0.2 else f"Series {i}",
+                generos=aleatorio.sample(GENEROS, aleatorio.randint(0, 3)),
+                cantidad_temporadas=aleatorio.randint(1, 12),
+                cantidad_episodios_totales=aleatorio.randint(4, 250),
+                fecha_emision_original=inicio,
+                fecha_emision_ultima=fin,
+                puntuacion=None if aleatorio.random() < 0.1 else round(aleatorio.uniform(1, 5), 1),
+                donde_ver=aleatorio.sample(PLATAFORMAS, aleatorio.randint(0, 2)),
+            )
+        )
+    return series
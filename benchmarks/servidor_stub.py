@@ -0,0 +1,165 @@
+"""Servidor HTTP local que simula las páginas de Sensacine para los benchmarks.
+
+Las páginas de listado (`/series-tv/?page=N`) reproducen `fixtures/listado.html` con links
+únicos por página, hasta `paginas` páginas; las siguientes vienen vacías, como al final del
+catálogo real. Cualquier otra ruta devuelve una de las páginas de serie de `fixtures/`
+(`PAGINAS_SERIE`), elegida de forma fija según la ruta, así que un crawl recorre tanto la
+página completa como las variantes a las que les faltan temporadas, puntuación, plataformas o
+el bloque de información. Cada respuesta se demora `latencia` ± `jitter` segundos y una
+fracción `tasa_errores` responde 503.
+
+También puede lanzarse solo, por ejemplo para probar el crawl distribuido con varios
+procesos locales:
+    pdm run python benchmarks/servidor_stub.py --puerto 8765 --paginas 5
+"""
+
+import argparse
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+DIRECTORIO_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def leer_fixture(nombre: str) -> bytes:
+    """Lee una página guardada del directorio de fixtures."""
+    with open(os.path.join(DIRECTORIO_FIXTURES, nombre), "rb") as f:
+        return f.read()
+
+
+# Páginas de serie: la grabada y variantes derivadas de ella sin algunos bloques, para que
+# el parseo y el crawl pasen por las ramas de datos faltantes de los extractores
+PAGINAS_SERIE = {
+    nombre: leer_fixture(f"{nombre}.html")
+    for nombre in ("serie", "serie_en_emision", "serie_sin_puntuacion", "serie_sin_ficha")
+}
+PAGINA_SERIE = PAGINAS_SERIE["serie"]
+PAGINA_LISTADO = leer_fixture("listado.html")
+
+PAGINA_LISTADO_VACIA = b"<html><body><ul></ul></body></html>"
+RUTA_LISTADO = "/series-tv/"
+_LINK_SERIE = re.compile(rb"/series/serie-(\d+)/")
+
+# Series por página de listado en el fixture
+SERIES_POR_PAGINA = len(_LINK_SERIE.findall(PAGINA_LISTADO))
+
+
+def pagina_listado(numero: int) -> bytes:
+    """Devuelve la página de listado `numero`, con links que no se repiten entre páginas."""
+    return _LINK_SERIE.sub(lambda m: b"/series/serie-%d-%s/" % (numero, m.group(1)), PAGINA_LISTADO)
+
+
+def pagina_serie(ruta: str) -> bytes:
+    """Devuelve la página de serie de `ruta`; la misma ruta recibe siempre la misma página."""
+    paginas = list(PAGINAS_SERIE.values())
+    return paginas[zlib.crc32(ruta.encode()) % len(paginas)]
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    """Responde las páginas de listado y de serie tras la latencia configurada."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latencia: float = 0.05
+    jitter: float = 0.0
+    tasa_errores: float = 0.0
+    paginas: Optional[int] = None
+    aleatorio: random.Random = random.Random(0)
+
+    def do_GET(self):
+        """Simula la latencia de red y devuelve la página pedida, o un error transitorio."""
+        time.sleep(max(0.0, self.latencia + self.aleatorio.uniform(-self.jitter, self.jitter)))
+        if self.tasa_errores and self.aleatorio.random() < self.tasa_errores:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        url = urlsplit(self.path)
+        if url.path == RUTA_LISTADO:
+            numero = int(parse_qs(url.query).get("page", ["1"])[0])
+            if self.paginas is None or numero <= self.paginas:
+                contenido = pagina_listado(numero)
+            else:
+                contenido = PAGINA_LISTADO_VACIA
+        else:
+            contenido = pagina_serie(url.path)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, format, *args):
+        """Silencia el log por petición del servidor."""
+
+
+def iniciar_servidor(
+    latencia: float = 0.05,
+    jitter: float = 0.0,
+    tasa_errores: float = 0.0,
+    paginas: Optional[int] = None,
+    semilla: int = 0,
+    puerto: int = 0,
+) -> tuple[ThreadingHTTPServer, str]:
+    """Inicia el servidor stub en un puerto libre y devuelve el servidor y su URL base.
+
+    Args:
+        latencia (float): Segundos de demora media de cada respuesta.
+        jitter (float): Variación máxima, uniforme, de la demora.
+        tasa_errores (float): Fracción de respuestas 503, entre 0 y 1.
+        paginas (Optional[int]): Páginas de listado con series. Si es None, todas tienen.
+        semilla (int): Semilla del jitter y de los errores.
+        puerto (int): Puerto local. Con 0 se elige uno libre.
+    """
+    manejador = type(
+        "Manejador",
+        (_Manejador,),
+        {
+            "latencia": latencia,
+            "jitter": jitter,
+            "tasa_errores": tasa_errores,
+            "paginas": paginas,
+            "aleatorio": random.Random(semilla),
+        },
+    )
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host, puerto = servidor.server_address[:2]
+    return servidor, f"http://{host}:{puerto}/"
+
+
+def main():
+    """Sirve las páginas simuladas hasta que se interrumpe el proceso."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto local (0 elige uno libre)")
+    parser.add_argument("--paginas", type=int, default=None, help="Páginas de listado con series")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variación de la latencia")
+    parser.add_argument("--tasa-errores", type=float, default=0.0, help="Fracción de 503")
+    argumentos = parser.parse_args()
+
+    servidor, base_url = iniciar_servidor(
+        latencia=argumentos.latencia,
+        jitter=argumentos.jitter,
+        tasa_errores=argumentos.tasa_errores,
+        paginas=argumentos.paginas,
+        puerto=argumentos.puerto,
+    )
+    print(f"Sirviendo en {base_url} (Ctrl+C para terminar)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
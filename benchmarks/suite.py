@@ -0,0 +1,349 @@
+"""Suite de benchmarks offline con líneas base para detectar regresiones de rendimiento.
+
+Mide, sin salir a internet:
+    - parseo: parseo + extracción de las páginas guardadas en `fixtures/`, alternando entre
+      las variantes de página de serie con y sin cada bloque de datos.
+    - crawl: el pipeline completo contra el servidor stub (latencia y jitter; los errores 503
+      están desactivados por defecto para que las mediciones sean comparables) con distintas
+      cantidades de hilos.
+    - dataframe: `datos_series_a_dataframe` y `limpiar_dataframe` sobre datasets sintéticos.
+    - analisis: cada función `respuesta_*` del análisis sobre datasets sintéticos.
+
+Los resultados se guardan en JSON y pueden compararse con una línea base anterior; el
+proceso termina con código 1 si algún caso es más lento que la base más allá de la
+tolerancia.
+
+Uso:
+    pdm run python benchmarks/suite.py --guardar benchmarks/base.json
+    pdm run python benchmarks/suite.py --comparar benchmarks/base.json
+    pdm run python benchmarks/suite.py --rapido --grupos parseo,dataframe
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import importlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/scraping")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/analisis")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import const
+
+# Se mide el código del crawl, no el límite de cortesía, la caché en disco ni los backoffs
+const.settings = dataclasses.replace(
+    const.settings,
+    peticiones_por_segundo=0,
+    usar_cache_http=False,
+    espera_base_reintento=0.01,
+    espera_maxima_reintento=0.1,
+    telemetria=False,
+)
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from almacenamiento import cargar_dataframe, guardar_dataframe
+from data_frame import datos_series_a_dataframe, limpiar_dataframe
+from datos_sinteticos import generar_series
+from extraer_datos import extraer_campos_desde_contenido
+from parser_html import parsear_html
+from pipeline import ejecutar_pipeline
+from pool_parseo import cerrar_pool_parseo
+from request import buscar_links_de_series
+from servidor_stub import PAGINA_LISTADO, PAGINAS_SERIE, SERIES_POR_PAGINA, iniciar_servidor
+from sesion import cerrar_sesion
+
+VERSION_FORMATO = 1
+GRUPOS = ("parseo", "crawl", "dataframe", "analisis")
+TOLERANCIA = 0.2
+
+
+@dataclasses.dataclass(frozen=True)
+class Parametros:
+    """Tamaños de cada grupo de casos."""
+
+    repeticiones: int = 5
+    paginas_parseo: int = 200
+    paginas_crawl: int = 10
+    hilos_crawl: tuple[int, ...] = (1, 4, 16)
+    latencia: float = 0.02
+    jitter: float = 0.01
+    tasa_errores: float = 0.0
+    cantidades_dataframe: tuple[int, ...] = (10_000, 100_000)
+    cantidades_analisis: tuple[int, ...] = (10_000, 100_000)
+
+
+PARAMETROS_RAPIDOS = Parametros(
+    repeticiones=3,
+    paginas_parseo=50,
+    paginas_crawl=3,
+    hilos_crawl=(1, 8),
+    cantidades_dataframe=(10_000,),
+    cantidades_analisis=(10_000,),
+)
+
+
+def medir(
+    funcion: Callable[..., object],
+    repeticiones: int,
+    preparar: Optional[Callable[[], object]] = None,
+) -> float:
+    """Devuelve el menor tiempo, en segundos, de `repeticiones` ejecuciones de `funcion`.
+
+    Como en `timeit`, el mínimo es la medición menos afectada por el resto de la máquina. Si
+    se entrega `preparar`, se llama antes de cada ejecución, fuera del tiempo medido, y su
+    resultado se pasa a `funcion`; así cada repetición parte de un estado nuevo.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        argumentos = () if preparar is None else (preparar(),)
+        inicio = time.perf_counter()
+        funcion(*argumentos)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def resultado(segundos: float, unidades: int, **extra) -> dict:
+    """Arma el resultado de un caso: tiempo, unidades procesadas y throughput."""
+    return {"segundos": segundos, "unidades": unidades, "por_segundo": unidades / segundos, **extra}
+
+
+def casos_parseo(parametros: Parametros) -> dict[str, dict]:
+    """Parseo + extracción de las páginas de serie y de listado guardadas."""
+    n = parametros.paginas_parseo
+    paginas_serie = list(PAGINAS_SERIE.values())
+
+    def series():
+        for i in range(n):
+            extraer_campos_desde_contenido(paginas_serie[i % len(paginas_serie)])
+
+    def listados():
+        for _ in range(n):
+            buscar_links_de_series(parsear_html(PAGINA_LISTADO))
+
+    return {
+        "parseo.serie": resultado(medir(series, parametros.repeticiones), n),
+        "parseo.listado": resultado(medir(listados, parametros.repeticiones), n),
+    }
+
+
+def casos_crawl(parametros: Parametros) -> dict[str, dict]:
+    """Crawl completo (listado + detalle) contra el servidor stub con varios niveles de hilos."""
+    resultados = {}
+    esperadas = parametros.paginas_crawl * SERIES_POR_PAGINA
+    for hilos in parametros.hilos_crawl:
+        servidores = []
+        completas: list[int] = []
+
+        def preparar() -> str:
+            # Un servidor por ejecución: cada host nuevo parte con la concurrencia adaptativa
+            # inicial, así que ninguna repetición hereda lo aprendido por la anterior
+            servidor, base_url = iniciar_servidor(
+                latencia=parametros.latencia,
+                jitter=parametros.jitter,
+                tasa_errores=parametros.tasa_errores,
+                paginas=parametros.paginas_crawl,
+            )
+            servidores.append(servidor)
+            return base_url
+
+        def crawl(base_url: str):
+            series = ejecutar_pipeline(
+                desde_pagina=1, hasta_pagina=None, max_workers=hilos, base_url=base_url
+            )
+            completas.append(sum(serie.fecha_extraccion is not None for serie in series))
+
+        try:
+            segundos = medir(crawl, parametros.repeticiones, preparar)
+        finally:
+            for servidor in servidores:
+                servidor.shutdown()
+                servidor.server_close()
+        completas_minimo = min(completas)
+        if completas_minimo != esperadas:
+            print(
+                f"Aviso: el crawl con {hilos} hilos completó {completas_minimo} de {esperadas} "
+                "series."
+            )
+        resultados[f"crawl.hilos_{hilos}"] = resultado(
+            segundos, completas_minimo, esperadas=esperadas
+        )
+    return resultados
+
+
+def casos_dataframe(parametros: Parametros) -> dict[str, dict]:
+    """Construcción y limpieza del DataFrame de series."""
+    resultados = {}
+    for cantidad in parametros.cantidades_dataframe:
+        series = generar_series(cantidad)
+        resultados[f"dataframe.construir_{cantidad}"] = resultado(
+            medir(lambda: datos_series_a_dataframe(series), parametros.repeticiones), cantidad
+        )
+        df = datos_series_a_dataframe(series)
+        resultados[f"dataframe.limpiar_{cantidad}"] = resultado(
+            medir(limpiar_dataframe, parametros.repeticiones, df.copy), cantidad
+        )
+    return resultados
+
+
+def dataset_analisis(cantidad: int, directorio: str) -> pd.DataFrame:
+    """Genera un dataset sintético y lo pasa por el disco, como el archivo del scraping."""
+    archivo = os.path.join(directorio, f"series_{cantidad}.parquet")
+    guardar_dataframe(
+        limpiar_dataframe(datos_series_a_dataframe(generar_series(cantidad))), archivo
+    )
+    return cargar_dataframe(archivo).drop_duplicates()
+
+
+def casos_analisis(parametros: Parametros) -> dict[str, dict]:
+    """Cada función de respuesta del análisis, sin la caché de resultados.
+
+    Cada repetición recibe una copia nueva del dataset: las cachés en memoria del análisis
+    (formato largo, índices, motor de agregaciones) se asocian a cada DataFrame, así que con
+    el mismo objeto solo la primera repetición pagaría su construcción.
+    """
+    analisis = importlib.import_module("src.analisis.main")
+    respuestas = [
+        funcion
+        for nombre, funcion in vars(analisis).items()
+        if nombre.startswith("respuesta_") and callable(funcion)
+    ]
+
+    resultados = {}
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        # Los gráficos se escriben en el directorio actual
+        os.chdir(directorio)
+        try:
+            for cantidad in parametros.cantidades_analisis:
+                df = dataset_analisis(cantidad, directorio)
+                for respuesta in respuestas:
+
+                    def ejecutar(copia: pd.DataFrame):
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            respuesta(copia)
+                        plt.close("all")
+
+                    nombre = respuesta.__name__.removeprefix("respuesta_")
+                    resultados[f"analisis.{nombre}_{cantidad}"] = resultado(
+                        medir(ejecutar, parametros.repeticiones, df.copy), cantidad
+                    )
+        finally:
+            os.chdir(directorio_original)
+    return resultados
+
+
+CASOS = {
+    "parseo": casos_parseo,
+    "crawl": casos_crawl,
+    "dataframe": casos_dataframe,
+    "analisis": casos_analisis,
+}
+
+
+def entorno() -> dict:
+    """Datos de la máquina y las versiones, para saber si dos líneas base son comparables."""
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def comparar(actual: dict, base: dict, tolerancia: float) -> list[str]:
+    """Imprime la comparación caso por caso y devuelve los casos que empeoraron."""
+    regresiones = []
+    print(f"\n{'caso':<60} {'base':>10} {'actual':>10} {'cambio':>8}")
+    for nombre, medicion in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            print(f"{nombre:<60} {'-':>10} {medicion['segundos']:>10.4f} {'nuevo':>8}")
+            continue
+        cambio = medicion["segundos"] / anterior["segundos"] - 1
+        marca = ""
+        if cambio > tolerancia:
+            regresiones.append(nombre)
+            marca = "  REGRESIÓN"
+        print(
+            f"{nombre:<60} {anterior['segundos']:>10.4f} {medicion['segundos']:>10.4f} "
+            f"{cambio:>+8.0%}{marca}"
+        )
+    if base.get("entorno", {}).get("cpus") != actual["entorno"]["cpus"]:
+        print("Aviso: la línea base se midió en una máquina con otra cantidad de CPUs.")
+    return regresiones
+
+
+def main():
+    """Ejecuta los grupos pedidos, guarda los resultados y los compara con la línea base."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grupos", default=",".join(GRUPOS), help="Grupos separados por coma")
+    parser.add_argument("--rapido", action="store_true", help="Datasets y repeticiones menores")
+    parser.add_argument("--guardar", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Línea base JSON con la que comparar")
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=TOLERANCIA,
+        help="Fracción de empeoramiento aceptada antes de marcar una regresión",
+    )
+    argumentos = parser.parse_args()
+
+    grupos = [grupo.strip() for grupo in argumentos.grupos.split(",") if grupo.strip()]
+    if desconocidos := set(grupos) - set(CASOS):
+        raise ValueError(f"Grupos desconocidos: {sorted(desconocidos)}. Opciones: {GRUPOS}")
+    parametros = PARAMETROS_RAPIDOS if argumentos.rapido else Parametros()
+
+    # Los errores 503 simulados generarían un log por reintento
+    logging.disable(logging.CRITICAL)
+    resultados: dict[str, dict] = {}
+    try:
+        for grupo in grupos:
+            for nombre, medicion in CASOS[grupo](parametros).items():
+                print(
+                    f"{nombre:<60} {medicion['segundos']:>10.4f} s "
+                    f"{medicion['por_segundo']:>12.1f}/s"
+                )
+                resultados[nombre] = medicion
+    finally:
+        cerrar_sesion()
+        cerrar_pool_parseo()
+
+    actual = {
+        "version": VERSION_FORMATO,
+        "entorno": entorno(),
+        "parametros": dataclasses.asdict(parametros),
+        "resultados": resultados,
+    }
+    if argumentos.guardar:
+        with open(argumentos.guardar, "w", encoding="utf-8") as f:
+            json.dump(actual, f, ensure_ascii=False, indent=2)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        # Se compara tras pasar por JSON, donde las tuplas quedan como listas
+        if base.get("parametros") != json.loads(json.dumps(actual["parametros"])):
+            print("Aviso: la línea base se midió con otros parámetros.")
+        if regresiones := comparar(actual, base, argumentos.tolerancia):
+            print(f"\n{len(regresiones)} casos más lentos que la línea base.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
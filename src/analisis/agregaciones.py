@@ -0,0 +1,79 @@
+"""Motor de agregaciones compartido por las preguntas del análisis de series de TV."""
+
+import os
+import sys
+import weakref
+from functools import cached_property
+
+import pandas as pd
+from utilities import cache_por_dataframe, mascara_anio_valido, split_df
+
+# Para poder importar de src.scraping
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.scraping.datos_serie import SerieColumn
+
+
+class MotorAgregaciones:
+    """
+    Calcula una sola vez, con un único `groupby().agg`, las estadísticas de puntaje por género, por plataforma y por año.
+
+    Cada tabla tiene las columnas `cantidad` (series en el grupo), `promedio`, `desviacion`,
+    `minimo` y `maximo` del puntaje de usuarios, y se reutiliza en todas las preguntas.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """Crea el motor sobre el DataFrame de series.
+
+        Guarda solo una referencia débil: el motor vive en la caché de `cache_por_dataframe`,
+        que se vacía cuando el DataFrame deja de existir, y una referencia fuerte lo
+        mantendría vivo para siempre.
+        """
+        self._df = weakref.ref(df)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame sobre el que se calculan las tablas."""
+        df = self._df()
+        if df is None:
+            raise ReferenceError("El DataFrame del motor de agregaciones ya no existe.")
+        return df
+
+    @staticmethod
+    def _agregar(agrupado) -> pd.DataFrame:
+        """Aplica todas las estadísticas en una sola pasada sobre los grupos."""
+        puntuacion = SerieColumn.PUNTUACION.value
+        return agrupado.agg(
+            cantidad=(SerieColumn.TITULO.value, "count"),
+            promedio=(puntuacion, "mean"),
+            desviacion=(puntuacion, "std"),
+            minimo=(puntuacion, "min"),
+            maximo=(puntuacion, "max"),
+        )
+
+    def _por_multivalor(self, columna: str) -> pd.DataFrame:
+        """Estadísticas por cada valor de una columna multivalor, expandiéndola una sola vez."""
+        COLUMNA_SPLIT, df_exploded = split_df(self.df, columna)
+        return self._agregar(df_exploded.groupby(COLUMNA_SPLIT, observed=True))
+
+    @cached_property
+    def por_genero(self) -> pd.DataFrame:
+        """Estadísticas de puntaje por género."""
+        return self._por_multivalor(SerieColumn.GENEROS.value)
+
+    @cached_property
+    def por_plataforma(self) -> pd.DataFrame:
+        """Estadísticas de puntaje por plataforma de streaming."""
+        return self._por_multivalor(SerieColumn.DONDE_VER.value)
+
+    @cached_property
+    def por_anio(self) -> pd.DataFrame:
+        """Estadísticas de puntaje por año de emisión original (solo años válidos)."""
+        anio = SerieColumn.FECHA_EMISION_ORIGINAL.value
+        df_filtrado = self.df[mascara_anio_valido(self.df, anio)]
+        return self._agregar(df_filtrado.groupby(anio))
+
+
+def motor_agregaciones(df: pd.DataFrame) -> MotorAgregaciones:
+    """Devuelve el motor de agregaciones de `df`, compartido entre todas las preguntas."""
+    return cache_por_dataframe(df, "motor_agregaciones", lambda: MotorAgregaciones(df))
@@ -0,0 +1,207 @@
+"""API de consultas diferidas sobre el dataset de series, con empuje de filtros y proyección."""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+import pandas as pd
+from indices import indice_bitmap
+from utilities import formato_largo, importar_data_frame
+
+# Para poder importar de src.scraping
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.scraping.almacenamiento import OPERADORES_FILTRO, aplicar_filtros
+
+# Operador adicional para columnas multivalor: la fila contiene el valor entre sus elementos
+CONTIENE = "contiene"
+
+
+@dataclass(frozen=True)
+class Filtrar:
+    """Paso que conserva las filas que cumplen `columna operador valor`."""
+
+    columna: str
+    operador: str
+    valor: Any
+
+
+@dataclass(frozen=True)
+class Explotar:
+    """Paso que expande una columna multivalor a una fila por elemento."""
+
+    columna: str
+
+
+@dataclass(frozen=True)
+class Agrupar:
+    """Paso que agrupa por columnas y calcula agregaciones con nombre."""
+
+    por: tuple[str, ...]
+    agregaciones: tuple[tuple[str, tuple[str, str]], ...]
+
+
+@dataclass(frozen=True)
+class Top:
+    """Paso que ordena por una columna y conserva las primeras `k` filas."""
+
+    k: int
+    por: str
+    ascendente: bool
+
+
+@dataclass(frozen=True)
+class Seleccionar:
+    """Paso que conserva solo algunas columnas."""
+
+    columnas: tuple[str, ...]
+
+
+Paso = Union[Filtrar, Explotar, Agrupar, Top, Seleccionar]
+
+
+def _explotar(df: pd.DataFrame, columna: str) -> pd.DataFrame:
+    """Expande `columna` a una fila por elemento, conservando las etiquetas de fila de `df`.
+
+    Con un índice único se usa el formato largo cacheado de `df`. Tras otra expansión el
+    índice se repite y unir por etiqueta multiplicaría las filas, así que se expande por
+    posición y luego se restauran las etiquetas.
+    """
+    if df.index.is_unique:
+        largo = formato_largo(df, columna).astype(df[columna].dtype)
+        return df.drop(columns=columna).join(largo.rename(columna))
+
+    por_posicion = df.set_axis(pd.RangeIndex(len(df)))
+    largo = formato_largo(por_posicion, columna).astype(df[columna].dtype)
+    resultado = por_posicion.drop(columns=columna).join(largo.rename(columna))
+    return resultado.set_axis(df.index.take(resultado.index.to_numpy()))
+
+
+class Consulta:
+    """
+    Consulta diferida sobre el dataset de series: se describe con métodos encadenables y solo se ejecuta con `ejecutar`.
+
+    Antes de ejecutar se planifica la consulta:
+    - los filtros se adelantan a las expansiones de otras columnas, para expandir menos filas;
+    - si la fuente es el archivo de datos, los filtros iniciales se aplican al leerlo y solo
+      se cargan las columnas que la consulta usa.
+
+    Ejemplo:
+        Consulta().filtrar("puntuacion", ">=", 4).explotar("generos").agrupar(
+            "generos", promedio=("puntuacion", "mean")
+        ).top(3, "promedio").ejecutar()
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, pasos: tuple[Paso, ...] = ()):
+        """Crea una consulta sobre `df`, o sobre el archivo de datos si es None."""
+        self._df = df
+        self._pasos = pasos
+
+    def _con(self, paso: Paso) -> "Consulta":
+        return Consulta(self._df, self._pasos + (paso,))
+
+    def filtrar(self, columna: str, operador: str, valor: Any) -> "Consulta":
+        """Conserva las filas que cumplen la condición (`==`, `<`, `in`, `contiene`, ...)."""
+        if operador not in OPERADORES_FILTRO and operador != CONTIENE:
+            raise ValueError(f"Operador de filtro no soportado: {operador}")
+        return self._con(Filtrar(columna, operador, valor))
+
+    def explotar(self, columna: str) -> "Consulta":
+        """Expande una columna multivalor; después de esto cada fila tiene un solo valor."""
+        return self._con(Explotar(columna))
+
+    def agrupar(self, *por: str, **agregaciones: tuple[str, str]) -> "Consulta":
+        """Agrupa por `por` y calcula agregaciones con nombre, p. ej. `promedio=("puntuacion", "mean")`."""
+        return self._con(Agrupar(tuple(por), tuple(agregaciones.items())))
+
+    def top(self, k: int, por: str, ascendente: bool = False) -> "Consulta":
+        """Ordena por `por` y conserva las primeras `k` filas."""
+        return self._con(Top(k, por, ascendente))
+
+    def seleccionar(self, *columnas: str) -> "Consulta":
+        """Conserva solo las columnas indicadas."""
+        return self._con(Seleccionar(tuple(columnas)))
+
+    def planificar(self) -> tuple[list[Filtrar], Optional[list[str]], list[Paso]]:
+        """
+        Optimiza la consulta.
+
+        Returns:
+            tuple: Filtros a aplicar al leer el archivo, columnas a cargar (None = todas) y
+            los pasos restantes en el orden en que se ejecutarán.
+        """
+        # Adelantar cada filtro mientras solo tenga delante filtros o expansiones de otras columnas
+        pasos: list[Paso] = []
+        for paso in self._pasos:
+            posicion = len(pasos)
+            if isinstance(paso, Filtrar):
+                while posicion > 0 and (
+                    isinstance(pasos[posicion - 1], Filtrar)
+                    or (
+                        isinstance(pasos[posicion - 1], Explotar)
+                        and pasos[posicion - 1].columna != paso.columna
+                    )
+                ):
+                    posicion -= 1
+            pasos.insert(posicion, paso)
+
+        # Los filtros iniciales con operadores estándar se aplican al leer el archivo
+        filtros_lectura: list[Filtrar] = []
+        if self._df is None:
+            while pasos and isinstance(pasos[0], Filtrar) and pasos[0].operador != CONTIENE:
+                filtros_lectura.append(pasos.pop(0))
+
+        # Proyección: columnas usadas hasta el primer paso que fija las columnas del resultado
+        columnas: Optional[set[str]] = None
+        usadas = {f.columna for f in filtros_lectura}
+        for paso in pasos:
+            if isinstance(paso, (Filtrar, Explotar)):
+                usadas.add(paso.columna)
+            elif isinstance(paso, Top):
+                usadas.add(paso.por)
+            elif isinstance(paso, Agrupar):
+                usadas.update(paso.por)
+                usadas.update(columna for _, (columna, _) in paso.agregaciones)
+                columnas = usadas
+                break
+            elif isinstance(paso, Seleccionar):
+                usadas.update(paso.columnas)
+                columnas = usadas
+                break
+
+        return filtros_lectura, sorted(columnas) if columnas is not None else None, pasos
+
+    def ejecutar(self) -> pd.DataFrame:
+        """Planifica y ejecuta la consulta, devolviendo el DataFrame resultante."""
+        filtros_lectura, columnas, pasos = self.planificar()
+
+        if self._df is None:
+            df = importar_data_frame(
+                columnas=columnas,
+                filtros=[(f.columna, f.operador, f.valor) for f in filtros_lectura] or None,
+            )
+        else:
+            df = self._df if columnas is None else self._df[columnas]
+
+        # Tras expandir una columna sus filas tienen un solo valor y el índice se repite, por lo
+        # que `contiene` sobre ella es una comparación de igualdad y no usa el índice bitmap
+        explotadas: set[str] = set()
+        for paso in pasos:
+            if isinstance(paso, Filtrar):
+                if paso.operador == CONTIENE and paso.columna in explotadas:
+                    df = df[df[paso.columna] == paso.valor]
+                elif paso.operador == CONTIENE:
+                    df = df[indice_bitmap(df, paso.columna).contiene(paso.valor)]
+                else:
+                    df = aplicar_filtros(df, [(paso.columna, paso.operador, paso.valor)])
+            elif isinstance(paso, Explotar):
+                df = _explotar(df, paso.columna)
+                explotadas.add(paso.columna)
+            elif isinstance(paso, Agrupar):
+                df = df.groupby(list(paso.por)).agg(**dict(paso.agregaciones)).reset_index()
+            elif isinstance(paso, Top):
+                df = df.sort_values(by=paso.por, ascending=paso.ascendente).head(paso.k)
+            elif isinstance(paso, Seleccionar):
+                df = df[list(paso.columnas)]
+        return df
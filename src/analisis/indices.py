@@ -0,0 +1,54 @@
+"""Índices bitmap sobre las columnas multivalor (géneros y plataformas) del DataFrame de series."""
+
+import numpy as np
+import pandas as pd
+from utilities import cache_por_dataframe, formato_largo
+
+
+class IndiceBitmap:
+    """
+    Un bitset por cada valor de una columna multivalor, alineado con las filas del DataFrame.
+
+    El bit i del bitset de "Drama" vale 1 si la fila i tiene ese género. Los bitsets se
+    guardan empaquetados (8 filas por byte), así que combinar varios valores es un AND u
+    OR vectorizado sobre arreglos pequeños, sin expandir el DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame, columna: str):
+        """Construye los bitsets de `columna` a partir de su formato largo."""
+        self.filas = len(df)
+        largo = formato_largo(df, columna)
+        posiciones = df.index.get_indexer(largo.index)
+        codigos = largo.cat.codes.to_numpy()
+        validos = codigos >= 0
+
+        matriz = np.zeros((len(largo.cat.categories), self.filas), dtype=bool)
+        matriz[codigos[validos], posiciones[validos]] = True
+        empaquetada = np.packbits(matriz, axis=1)
+        self._bitsets = {valor: empaquetada[i] for i, valor in enumerate(largo.cat.categories)}
+        self._vacio = np.zeros(empaquetada.shape[1], dtype=np.uint8)
+
+    def _bitset(self, valor: str) -> np.ndarray:
+        return self._bitsets.get(valor, self._vacio)
+
+    def _a_mascara(self, bitset: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bitset, count=self.filas).astype(bool)
+
+    def contiene(self, valor: str) -> np.ndarray:
+        """Máscara de las filas que tienen `valor`."""
+        return self._a_mascara(self._bitset(valor))
+
+    def todos(self, valores: list[str]) -> np.ndarray:
+        """Máscara de las filas que tienen todos los `valores`."""
+        bitset = np.bitwise_and.reduce([self._bitset(v) for v in valores])
+        return self._a_mascara(bitset)
+
+    def alguno(self, valores: list[str]) -> np.ndarray:
+        """Máscara de las filas que tienen al menos uno de los `valores`."""
+        bitset = np.bitwise_or.reduce([self._bitset(v) for v in valores])
+        return self._a_mascara(bitset)
+
+
+def indice_bitmap(df: pd.DataFrame, columna: str) -> IndiceBitmap:
+    """Devuelve el índice bitmap de `columna`, construyéndolo la primera vez para cada DataFrame."""
+    return cache_por_dataframe(df, ("indice_bitmap", columna), lambda: IndiceBitmap(df, columna))
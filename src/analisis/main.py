@@ -1,16 +1,24 @@
 """Módulo principal de análisis para el proyecto de Web Scraping de series de TV."""
 
+import functools
 import os
 import sys
 
 import matplotlib.pyplot as plt
 import pandas as pd
-from utilities import importar_data_frame, imprimir_data_frame, split_df
+from agregaciones import motor_agregaciones
+from consulta import Consulta
+from indices import indice_bitmap
+from memoizacion import ejecutar_memorizado, genera_archivos, obtener_cache_resultados
+from utilities import importar_data_frame, imprimir_data_frame, mascara_anio_valido, split_df
 
 # Para poder importar de src.scraping
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
+from src.scraping.almacenamiento import buscar_archivo_datos
+from src.scraping.const import settings
 from src.scraping.datos_serie import SerieColumn, SerieNullValues
+from src.scraping.perfilado import ejecucion_perfilada, etapa, perfilado_activo, perfilar
 
 
 ###
@@ -18,6 +26,7 @@ from src.scraping.datos_serie import SerieColumn, SerieNullValues
 # ver series en la lista de sensacine?
 # ¿Cuántas series pueden verse en cada servicio de streaming según
 # la lista de sensacine?
+@perfilar
 def respuesta_donde_ver(df: pd.DataFrame):
     """Muestra una tabla con la cantidad de series disponibles en cada servicio de streaming."""
     DONDE_VER_SPLIT, df_exploded = split_df(df, SerieColumn.DONDE_VER.value)
@@ -33,6 +42,8 @@ def respuesta_donde_ver(df: pd.DataFrame):
 # ¿Como se distribuye la cantidad de géneros en este conjunto de series?
 # Ademas, con esta información construya un gráfico de barras.
 # Para esto pueden utilizar la librería **Matplotlib**.
+@genera_archivos("distribucion_generos.png")
+@perfilar
 def respuesta_generos(df: pd.DataFrame):
     """Analiza y grafica la distribución de géneros en el conjunto de series."""
     GENEROS_SPLIT, df_exploded = split_df(df, SerieColumn.GENEROS.value)
@@ -58,22 +69,22 @@ def respuesta_generos(df: pd.DataFrame):
 # Entregue una tabla con las 30 series con más de 2 temporadas
 # y mayor puntaje hecho por usuarios.
 # Muestre solamente nombre, puntaje, cantidad de temporadas y cantidad de episodios
+@perfilar
 def respuesta_series_con_mas_temporadas_puntaje(df: pd.DataFrame):
     """Muestra una tabla con las 30 series con más de 2 temporadas y mayor puntaje de usuarios."""
-    # Filtrar series con más de 2 temporadas
-    df_filtrado = df[df[SerieColumn.CANTIDAD_TEMPORADAS.value] > 2]
-
-    # Seleccionar columnas relevantes
-    columnas = [
-        SerieColumn.TITULO.value,
-        SerieColumn.PUNTUACION.value,
-        SerieColumn.CANTIDAD_TEMPORADAS.value,
-        SerieColumn.CANTIDAD_EPISODIOS_TOTALES.value,
-    ]
-    df_seleccion = df_filtrado[columnas]
-
-    # Ordenar por puntaje descendente y tomar los 30 primeros
-    df_top = df_seleccion.sort_values(by=SerieColumn.PUNTUACION.value, ascending=False).head(30)
+    # Series con más de 2 temporadas, las 30 de mayor puntaje
+    df_top = (
+        Consulta(df)
+        .filtrar(SerieColumn.CANTIDAD_TEMPORADAS.value, ">", 2)
+        .top(30, SerieColumn.PUNTUACION.value)
+        .seleccionar(
+            SerieColumn.TITULO.value,
+            SerieColumn.PUNTUACION.value,
+            SerieColumn.CANTIDAD_TEMPORADAS.value,
+            SerieColumn.CANTIDAD_EPISODIOS_TOTALES.value,
+        )
+        .ejecutar()
+    )
 
     # Renombrar columnas para la tabla
     df_top = df_top.rename(
@@ -96,19 +107,15 @@ def respuesta_series_con_mas_temporadas_puntaje(df: pd.DataFrame):
 # (desviación estándar, promedio, valor máximo y mínimo) de los 3 géneros de
 # series que tengan la mayor puntuación promedio y los 2 generos que tengan
 # la menor puntuación promedio.
+@perfilar
 def respuesta_puntaje_generos_estadisticas(df: pd.DataFrame):
     """Calcula el puntaje promedio por género y muestra estadísticas descriptivas de los géneros con mayor y menor puntaje."""
-    GENEROS_SPLIT, df_exploded = split_df(df, SerieColumn.GENEROS.value)
+    estadisticas = motor_agregaciones(df).por_genero
 
-    # Calcular puntaje promedio por género
-    puntaje_por_genero = (
-        df_exploded.groupby(GENEROS_SPLIT)[SerieColumn.PUNTUACION.value].mean().round(3)
-    )
-    tabla = puntaje_por_genero.reset_index().rename(
-        columns={
-            GENEROS_SPLIT: "Genero",
-            SerieColumn.PUNTUACION.value: "Puntaje por usuario promedio",
-        }
+    # Puntaje promedio por género
+    puntaje_por_genero = estadisticas["promedio"].round(3)
+    tabla = puntaje_por_genero.rename_axis("Genero").reset_index(
+        name="Puntaje por usuario promedio"
     )
 
     imprimir_data_frame(tabla, mensaje="Tabla de puntaje promedio por género:")
@@ -119,47 +126,42 @@ def respuesta_puntaje_generos_estadisticas(df: pd.DataFrame):
 
     print("\nEstadísticas descriptivas de los 3 géneros con mayor puntaje promedio:")
     for genero in top3.index:
-        puntajes = df_exploded[df_exploded[GENEROS_SPLIT] == genero][SerieColumn.PUNTUACION.value]
+        fila = estadisticas.loc[genero]
         print(f"\nGénero: {genero}")
-        print(f"Promedio: {puntajes.mean():.3f}")
-        print(f"Desviación estándar: {puntajes.std():.3f}")
-        print(f"Máximo: {puntajes.max():.3f}")
-        print(f"Mínimo: {puntajes.min():.3f}")
+        print(f"Promedio: {fila['promedio']:.3f}")
+        print(f"Desviación estándar: {fila['desviacion']:.3f}")
+        print(f"Máximo: {fila['maximo']:.3f}")
+        print(f"Mínimo: {fila['minimo']:.3f}")
 
     print("\nEstadísticas descriptivas de los 2 géneros con menor puntaje promedio:")
     for genero in bottom2.index:
-        puntajes = df_exploded[df_exploded[GENEROS_SPLIT] == genero][SerieColumn.PUNTUACION.value]
+        fila = estadisticas.loc[genero]
 
         # Calculo de la desviacion estandar
-        desv = puntajes.std()
+        desv = fila["desviacion"]
         if pd.isna(desv):
             desv_str = "No aplica"
         else:
             desv_str = f"{desv:.3f}"
 
         print(f"\nGénero: {genero}")
-        print(f"Promedio: {puntajes.mean():.3f}")
+        print(f"Promedio: {fila['promedio']:.3f}")
         print(f"Desviación estándar: {desv_str}")
-        print(f"Máximo: {puntajes.max():.3f}")
-        print(f"Mínimo: {puntajes.min():.3f}")
+        print(f"Máximo: {fila['maximo']:.3f}")
+        print(f"Mínimo: {fila['minimo']:.3f}")
 
 
 ###
 # Entregue una tabla con los servicios de streaming,
 # la cantidad de series que se pueden observar en cada uno de ellos y
 # el puntaje por usuario promedio de estas series, redondée a 3 decimales.
+@perfilar
 def respuesta_streaming_cant_series_puntaje(df: pd.DataFrame):
     """Muestra una tabla con la cantidad de series y el puntaje promedio por servicio de streaming."""
-    DONDE_VER_SPLIT, df_exploded = split_df(df, SerieColumn.DONDE_VER.value)
-
-    # Se agrupa por Servicio de Streaming
-    df_agrupado = df_exploded.groupby(DONDE_VER_SPLIT)
-
-    # Calcular cantidad de series
-    cantidad_series = df_agrupado[SerieColumn.TITULO.value].count()
-
-    # Calcular puntaje promedio por servicio
-    puntaje_por_servicio = df_agrupado[SerieColumn.PUNTUACION.value].mean().round(3)
+    # Estadísticas por Servicio de Streaming
+    estadisticas = motor_agregaciones(df).por_plataforma
+    cantidad_series = estadisticas["cantidad"]
+    puntaje_por_servicio = estadisticas["promedio"].round(3)
 
     # Unir ambas métricas en una sola tabla
     tabla = pd.DataFrame(
@@ -180,42 +182,34 @@ def respuesta_streaming_cant_series_puntaje(df: pd.DataFrame):
 # por usuarios entre mínimo 3.5 y máximo 5.0, que tenga como género Drama,
 # que tengan 2 o más Temporadas, que hayan terminado de emitirse y
 # pueda verse en una plataforma de streaming.
+@perfilar
 def respuesta_series_puntuacion_en_limites(df: pd.DataFrame):
     """Filtra y muestra series con puntaje entre 3.5 y 5, género Drama, 2+ temporadas, terminadas y disponibles en streaming."""
-    from datetime import datetime
+    generos = indice_bitmap(df, SerieColumn.GENEROS.value)
 
-    # Filtrar por puntaje
+    # Filtrar por puntaje y por género Drama
     df_filtrado = df[
-        (df[SerieColumn.PUNTUACION.value] >= 3.5) & (df[SerieColumn.PUNTUACION.value] <= 5)
-    ].copy()
-
-    GENEROS_SPLIT, df_exploded = split_df(df_filtrado, SerieColumn.GENEROS.value)
-
-    # Filtrar por género Drama
-    df_exploded = df_exploded[df_exploded[GENEROS_SPLIT] == "Drama"]
+        (df[SerieColumn.PUNTUACION.value] >= 3.5)
+        & (df[SerieColumn.PUNTUACION.value] <= 5)
+        & generos.contiene("Drama")
+    ]
 
     # Filtrar por temporadas
-    df_exploded = df_exploded[df_exploded[SerieColumn.CANTIDAD_TEMPORADAS.value] >= 2]
+    df_filtrado = df_filtrado[df_filtrado[SerieColumn.CANTIDAD_TEMPORADAS.value] >= 2]
 
     # Filtrar por series terminadas
-    df_exploded = df_exploded[
-        (df_exploded[SerieColumn.FECHA_EMISION_ULTIMA.value].notnull())
-        & (
-            df_exploded[SerieColumn.FECHA_EMISION_ULTIMA.value].astype(int)
-            != SerieNullValues.FECHA_EMISION_ULTIMA.value
-        )
-        & (df_exploded[SerieColumn.FECHA_EMISION_ULTIMA.value].astype(int) > 1900)
-        & (df_exploded[SerieColumn.FECHA_EMISION_ULTIMA.value].astype(int) <= datetime.now().year)
+    df_filtrado = df_filtrado[
+        mascara_anio_valido(df_filtrado, SerieColumn.FECHA_EMISION_ULTIMA.value)
     ]
 
     # Filtrar por disponibilidad en streaming (excluye cualquier "No disponible")
-    df_exploded = df_exploded[
-        (df_exploded[SerieColumn.DONDE_VER.value].notnull())
-        & (~df_exploded[SerieColumn.DONDE_VER.value].str.contains(SerieNullValues.DONDE_VER.value))
+    df_filtrado = df_filtrado[
+        (df_filtrado[SerieColumn.DONDE_VER.value].notnull())
+        & (~df_filtrado[SerieColumn.DONDE_VER.value].str.contains(SerieNullValues.DONDE_VER.value))
     ]
 
-    # Eliminar duplicados por serie y plataforma
-    df_exploded = df_exploded.drop_duplicates(
+    # Eliminar series repetidas
+    df_filtrado = df_filtrado.drop_duplicates(
         subset=[
             SerieColumn.TITULO.value,
             SerieColumn.PUNTUACION.value,
@@ -226,7 +220,7 @@ def respuesta_series_puntuacion_en_limites(df: pd.DataFrame):
     )
 
     imprimir_data_frame(
-        df_exploded,
+        df_filtrado,
         mensaje="Tabla de series con puntuación entre 3.5 y 5, género Drama, 2+ temporadas, terminadas y disponibles en streaming:",
         columnas=[
             SerieColumn.TITULO.value,
@@ -241,23 +235,15 @@ def respuesta_series_puntuacion_en_limites(df: pd.DataFrame):
 ###
 # ¿Cúal es la plataforma de streaming que vale la pena contratar
 # según calidad/cantidad de series de acuerdo con los datos de Sensacine?
+@perfilar
 def respuesta_mejor_plataforma_streaming(df: pd.DataFrame):
     """Calcula y muestra la mejor plataforma de streaming según calidad y cantidad de series."""
-    DONDE_VER_SPLIT, df_exploded = split_df(df, SerieColumn.DONDE_VER.value)
-
-    df_exploded = df_exploded[
-        (df_exploded[DONDE_VER_SPLIT].notnull())
-        & (~df_exploded[SerieColumn.DONDE_VER.value].str.contains(SerieNullValues.DONDE_VER.value))
-    ]
-
-    # Se agrupa por Servicio de Streaming
-    df_agrupado = df_exploded.groupby(DONDE_VER_SPLIT)
-
-    # Calcular cantidad de series
-    cantidad_series = df_agrupado[SerieColumn.TITULO.value].count()
-
-    # Calcular puntaje promedio por servicio
-    puntaje_por_servicio = df_agrupado[SerieColumn.PUNTUACION.value].mean()
+    # Estadísticas por Servicio de Streaming, sin las series que no están disponibles
+    estadisticas = motor_agregaciones(df).por_plataforma.drop(
+        index=SerieNullValues.DONDE_VER.value, errors="ignore"
+    )
+    cantidad_series = estadisticas["cantidad"]
+    puntaje_por_servicio = estadisticas["promedio"]
 
     # Normalizar ambos valores (min-max)
     min_cant, max_cant = cantidad_series.min(), cantidad_series.max()
@@ -302,30 +288,30 @@ def respuesta_mejor_plataforma_streaming(df: pd.DataFrame):
 # entre mínimo 4 y máximo 5.0, que tenga como género Animación, que hayan
 # sido emitidas durante el ultimo año (2025) y pueda verse en una
 # plataforma de streaming.
+@perfilar
 def respuesta_series_puntaje_4_5_animacion_ultimo_ano_ver(df: pd.DataFrame):
     """Muestra series de animación con puntaje entre 4 y 5, emitidas en el último año y disponibles en streaming."""
-    # Filtrar por puntaje
-    df_filtrado = df[
-        (df[SerieColumn.PUNTUACION.value] >= 4) & (df[SerieColumn.PUNTUACION.value] <= 5)
-    ].copy()
-
-    GENEROS_SPLIT, df_exploded = split_df(df_filtrado, SerieColumn.GENEROS.value)
+    generos = indice_bitmap(df, SerieColumn.GENEROS.value)
 
-    # Filtrar por género Animación
-    df_exploded = df_exploded[df_exploded[GENEROS_SPLIT] == "Animación"]
+    # Filtrar por puntaje y por género Animación
+    df_filtrado = df[
+        (df[SerieColumn.PUNTUACION.value] >= 4)
+        & (df[SerieColumn.PUNTUACION.value] <= 5)
+        & generos.contiene("Animación")
+    ]
 
     # Filtrar por series emitidas en 2025
-    df_exploded = df_exploded[df_exploded[SerieColumn.FECHA_EMISION_ORIGINAL.value] == 2025]
+    df_filtrado = df_filtrado[df_filtrado[SerieColumn.FECHA_EMISION_ORIGINAL.value] == 2025]
 
     # Filtrar por disponibilidad en streaming
-    df_exploded = df_exploded[
-        (df_exploded[SerieColumn.DONDE_VER.value].notnull())
-        & (~df_exploded[SerieColumn.DONDE_VER.value].str.contains(SerieNullValues.DONDE_VER.value))
+    df_filtrado = df_filtrado[
+        (df_filtrado[SerieColumn.DONDE_VER.value].notnull())
+        & (~df_filtrado[SerieColumn.DONDE_VER.value].str.contains(SerieNullValues.DONDE_VER.value))
     ]
 
     # Mostrar tabla
     imprimir_data_frame(
-        df_exploded,
+        df_filtrado,
         mensaje="Tabla de series de animación con puntaje entre 4 y 5, emitidas en 2025 y disponibles en streaming:",
         columnas=[
             SerieColumn.TITULO.value,
@@ -339,25 +325,21 @@ def respuesta_series_puntaje_4_5_animacion_ultimo_ano_ver(df: pd.DataFrame):
 # En base a tu analisis ¿Que serie de animación reciente
 # recomendarias a un fan de la acción?
 # ¿Para un fan de la comedia?
+@perfilar
 def respuesta_recomendacion(df: pd.DataFrame):
     """Recomienda series de animación recientes para fans de acción y comedia."""
-    GENEROS_SPLIT, df_exploded = split_df(df, SerieColumn.GENEROS.value)
+    generos = indice_bitmap(df, SerieColumn.GENEROS.value)
 
-    # Filtrar series de animación emitidas en el último año (2025)
-    df_animacion_2025 = df_exploded[
-        (df_exploded[GENEROS_SPLIT] == "Animación")
-        & (df_exploded[SerieColumn.FECHA_EMISION_ORIGINAL.value] == 2025)
-    ]
+    # Series de animación emitidas en el último año (2025)
+    animacion_2025 = generos.contiene("Animación") & (
+        df[SerieColumn.FECHA_EMISION_ORIGINAL.value] == 2025
+    )
 
     # Buscar series que también tengan Acción
-    df_accion = df_animacion_2025[
-        df_animacion_2025[SerieColumn.GENEROS.value].str.contains("Acción")
-    ]
+    df_accion = df[animacion_2025 & generos.contiene("Acción")]
 
     # Buscar series que también tengan Comedia
-    df_comedia = df_animacion_2025[
-        df_animacion_2025[SerieColumn.GENEROS.value].str.contains("Comedia")
-    ]
+    df_comedia = df[animacion_2025 & generos.contiene("Comedia")]
 
     # Ordenar por puntaje descendente
     df_accion_sorted = df_accion.sort_values(by=SerieColumn.PUNTUACION.value, ascending=False)
@@ -389,20 +371,11 @@ def respuesta_recomendacion(df: pd.DataFrame):
 ###
 # Entregue una tabla con series con la serie mejor evaluada
 # por cada año segun su fecha original de emisión.
+@perfilar
 def respuesta_series_mejor_evaluadas_por_anio(df: pd.DataFrame):
     """Muestra la serie mejor evaluada por cada año de emisión original."""
-    from datetime import datetime
-
     # Agrupar por año de emisión original y obtener la serie con mayor puntaje en cada año
-    df_filtrado = df[
-        (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].notnull())
-        & (
-            df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int)
-            != SerieNullValues.FECHA_EMISION_ORIGINAL.value
-        )
-        & (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int) > 1900)
-        & (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int) <= datetime.now().year)
-    ]
+    df_filtrado = df[mascara_anio_valido(df, SerieColumn.FECHA_EMISION_ORIGINAL.value)]
     idx = df_filtrado.groupby(SerieColumn.FECHA_EMISION_ORIGINAL.value)[
         SerieColumn.PUNTUACION.value
     ].idxmax()
@@ -429,24 +402,12 @@ def respuesta_series_mejor_evaluadas_por_anio(df: pd.DataFrame):
 ###
 # Presente un histograma con el puntaje promedio de
 # las series estrenadas durante ese año por cada año.
+@genera_archivos("puntaje_promedio_por_año.png")
+@perfilar
 def respuesta_puntaje_promedio_por_anio(df: pd.DataFrame):
     """Presenta un histograma con el puntaje promedio de las series estrenadas por año."""
-    from datetime import datetime
-
-    df_filtrado = df[
-        (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].notnull())
-        & (
-            df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int)
-            != SerieNullValues.FECHA_EMISION_ORIGINAL.value
-        )
-        & (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int) > 1900)
-        & (df[SerieColumn.FECHA_EMISION_ORIGINAL.value].astype(int) <= datetime.now().year)
-    ]
-
-    df_agrupado = df_filtrado.groupby(SerieColumn.FECHA_EMISION_ORIGINAL.value)[
-        SerieColumn.PUNTUACION.value
-    ].mean()
-    df_tabla = df_agrupado.reset_index()
+    df_agrupado = motor_agregaciones(df).por_anio["promedio"]
+    df_tabla = df_agrupado.rename(SerieColumn.PUNTUACION.value).reset_index()
 
     # Graficar puntaje promedio por año (gráfico de barras)
     plt.figure(figsize=(12, 6))
@@ -462,34 +423,58 @@ def respuesta_puntaje_promedio_por_anio(df: pd.DataFrame):
     print("Grafico generado")
 
 
+@ejecucion_perfilada("analisis", settings)
 def main():
-    """Ejecuta el análisis principal sobre el DataFrame de series de TV."""
-    df = importar_data_frame()
-
-    df = df.drop_duplicates()
-
-    print("\nParte 2.1")
-    respuesta_donde_ver(df)
-
-    print("\nParte 2.2")
-    respuesta_generos(df)
-
-    print("\nParte 2.3")
-    respuesta_series_con_mas_temporadas_puntaje(df)
-    respuesta_puntaje_generos_estadisticas(df)
-    respuesta_streaming_cant_series_puntaje(df)
-
-    print("\nParte 2.4")
-    respuesta_series_puntuacion_en_limites(df)
-    respuesta_mejor_plataforma_streaming(df)
-
-    print("\nParte 2.5")
-    respuesta_series_puntaje_4_5_animacion_ultimo_ano_ver(df)
-    respuesta_recomendacion(df)
+    """
+    Ejecuta el análisis principal sobre el DataFrame de series de TV.
+
+    Los resultados se reutilizan de la caché mientras no cambien el archivo de datos ni el
+    código del análisis; en ese caso el DataFrame ni siquiera se carga. Al perfilar no se usa
+    la caché, para medir el cálculo real de cada respuesta.
+    """
+    cache = None if perfilado_activo() else obtener_cache_resultados()
+    archivo = buscar_archivo_datos(settings.nombre_base_datos)
+    huella = cache.huella_archivo(archivo) if cache is not None else ""
+
+    @functools.cache
+    def obtener_df() -> pd.DataFrame:
+        with etapa("carga del DataFrame"):
+            return importar_data_frame().drop_duplicates()
+
+    partes = [
+        ("Parte 2.1", [respuesta_donde_ver]),
+        ("Parte 2.2", [respuesta_generos]),
+        (
+            "Parte 2.3",
+            [
+                respuesta_series_con_mas_temporadas_puntaje,
+                respuesta_puntaje_generos_estadisticas,
+                respuesta_streaming_cant_series_puntaje,
+            ],
+        ),
+        (
+            "Parte 2.4",
+            [respuesta_series_puntuacion_en_limites, respuesta_mejor_plataforma_streaming],
+        ),
+        (
+            "Parte 2.5",
+            [respuesta_series_puntaje_4_5_animacion_ultimo_ano_ver, respuesta_recomendacion],
+        ),
+        (
+            "Parte 2.6",
+            [respuesta_series_mejor_evaluadas_por_anio, respuesta_puntaje_promedio_por_anio],
+        ),
+    ]
 
-    print("\nParte 2.6")
-    respuesta_series_mejor_evaluadas_por_anio(df)
-    respuesta_puntaje_promedio_por_anio(df)
+    try:
+        for titulo, respuestas in partes:
+            print(f"\n{titulo}")
+            with etapa(titulo):
+                for respuesta in respuestas:
+                    ejecutar_memorizado(cache, respuesta, huella, obtener_df)
+    finally:
+        if cache is not None:
+            cache.cerrar()
 
 
 if __name__ == "__main__":
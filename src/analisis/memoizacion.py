@@ -0,0 +1,260 @@
+"""Caché en disco de los resultados del análisis, indexada por la huella del dataset."""
+
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from datetime import date
+from typing import Callable, Optional
+
+import pandas as pd
+
+# Para poder importar de src.scraping
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.scraping.const import settings
+
+# Bytes leídos por iteración al calcular la huella de un archivo
+TAMANO_BLOQUE_HUELLA = 1024 * 1024
+
+
+def _resumen(*partes: bytes) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    for parte in partes:
+        h.update(parte)
+    return h.hexdigest()
+
+
+# Raíz de `src`: los módulos cargados desde aquí forman parte de la huella del código
+DIRECTORIO_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@functools.lru_cache(maxsize=None)
+def _huella_modulos(rutas: tuple[str, ...]) -> str:
+    partes = [pd.__version__.encode()]
+    for ruta in rutas:
+        partes.append(ruta.encode())
+        with open(ruta, "rb") as f:
+            partes.append(f.read())
+    return _resumen(*partes)
+
+
+def version_codigo() -> str:
+    """
+    Huella del código del análisis: cambia si se modifica cualquier módulo de este directorio
+    o cualquier otro módulo de `src` cargado (p. ej. `src.scraping.almacenamiento` o `const`).
+
+    Incluye la versión de pandas, que puede cambiar el formato de las tablas.
+    """
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    rutas = set(glob.glob(os.path.join(directorio, "*.py")))
+    for modulo in list(sys.modules.values()):
+        archivo = getattr(modulo, "__file__", None)
+        if archivo and os.path.abspath(archivo).startswith(DIRECTORIO_SRC + os.sep):
+            rutas.add(os.path.abspath(archivo))
+    return _huella_modulos(tuple(sorted(rutas)))
+
+
+def clave_resultado(funcion: Callable, huella_datos: str, *args, **kwargs) -> str:
+    """Clave de caché de `funcion(df, *args, **kwargs)` sobre el dataset con huella `huella_datos`."""
+    identidad = f"{funcion.__module__}.{funcion.__qualname__}"
+    parametros = repr((args, sorted(kwargs.items())))
+    # La limpieza descarta los años posteriores al actual, así que el resultado depende del año
+    anio = str(date.today().year)
+    return _resumen(
+        huella_datos.encode(),
+        identidad.encode(),
+        parametros.encode(),
+        version_codigo().encode(),
+        anio.encode(),
+    )
+
+
+def genera_archivos(*archivos: str):
+    """Decorador que declara los archivos (p. ej. gráficos) que escribe una función de análisis."""
+
+    def decorar(funcion: Callable) -> Callable:
+        funcion.archivos_generados = archivos
+        return funcion
+
+    return decorar
+
+
+class CacheResultados:
+    """
+    Resultados del análisis guardados sobre SQLite, con desalojo LRU por tamaño.
+
+    De cada resultado se guarda lo que la función imprimió y el contenido de los archivos
+    que generó, de modo que puede reproducirse sin recalcular ni volver a graficar.
+    """
+
+    def __init__(self, ruta: str, tamano_maximo: int):
+        """Abre (o crea) la base de datos de la caché.
+
+        Args:
+            ruta (str): Archivo SQLite donde se guardan los resultados.
+            tamano_maximo (int): Bytes máximos guardados antes de desalojar resultados.
+        """
+        self.tamano_maximo = tamano_maximo
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                clave TEXT PRIMARY KEY,
+                salida TEXT NOT NULL,
+                archivos BLOB NOT NULL,
+                accedido REAL NOT NULL,
+                tamano INTEGER NOT NULL
+            )
+            """)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS huellas (
+                ruta TEXT PRIMARY KEY,
+                tamano INTEGER NOT NULL,
+                modificado INTEGER NOT NULL,
+                huella TEXT NOT NULL
+            )
+            """)
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resultados_accedido ON resultados (accedido)"
+        )
+        self._conexion.commit()
+
+    def huella_archivo(self, ruta: str) -> str:
+        """
+        Huella del contenido de un archivo de datos.
+
+        El hash se recalcula solo si cambió el tamaño o la fecha de modificación del archivo.
+        """
+        ruta_absoluta = os.path.abspath(ruta)
+        estado = os.stat(ruta_absoluta)
+        fila = self._conexion.execute(
+            "SELECT huella FROM huellas WHERE ruta = ? AND tamano = ? AND modificado = ?",
+            (ruta_absoluta, estado.st_size, estado.st_mtime_ns),
+        ).fetchone()
+        if fila is not None:
+            return fila[0]
+
+        h = hashlib.blake2b(digest_size=20)
+        with open(ruta_absoluta, "rb") as f:
+            while bloque := f.read(TAMANO_BLOQUE_HUELLA):
+                h.update(bloque)
+        huella = h.hexdigest()
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO huellas VALUES (?, ?, ?, ?)",
+            (ruta_absoluta, estado.st_size, estado.st_mtime_ns, huella),
+        )
+        self._conexion.commit()
+        return huella
+
+    def obtener(self, clave: str) -> Optional[tuple[str, dict[str, bytes]]]:
+        """Devuelve la salida impresa y los archivos generados de un resultado, o None."""
+        fila = self._conexion.execute(
+            "SELECT salida, archivos FROM resultados WHERE clave = ?", (clave,)
+        ).fetchone()
+        if fila is None:
+            return None
+        self._conexion.execute(
+            "UPDATE resultados SET accedido = ? WHERE clave = ?", (time.time(), clave)
+        )
+        self._conexion.commit()
+        return fila[0], pickle.loads(fila[1])
+
+    def guardar(self, clave: str, salida: str, archivos: dict[str, bytes]):
+        """Guarda (o reemplaza) un resultado y desaloja si se supera el tamaño máximo."""
+        archivos_serializados = pickle.dumps(archivos)
+        tamano = len(salida.encode()) + len(archivos_serializados)
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+            (clave, salida, archivos_serializados, time.time(), tamano),
+        )
+        self._desalojar()
+        self._conexion.commit()
+
+    def _desalojar(self):
+        """Elimina los resultados menos usados recientemente hasta respetar el tamaño máximo."""
+        total = self._conexion.execute(
+            "SELECT COALESCE(SUM(tamano), 0) FROM resultados"
+        ).fetchone()[0]
+        while total > self.tamano_maximo:
+            fila = self._conexion.execute(
+                "SELECT clave, tamano FROM resultados ORDER BY accedido LIMIT 1"
+            ).fetchone()
+            if fila is None:
+                break
+            self._conexion.execute("DELETE FROM resultados WHERE clave = ?", (fila[0],))
+            total -= fila[1]
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        self._conexion.close()
+
+
+def _restaurar_archivo(nombre: str, contenido: bytes):
+    """Escribe el archivo guardado en caché, salvo que ya exista con el mismo contenido."""
+    if os.path.exists(nombre) and os.path.getsize(nombre) == len(contenido):
+        with open(nombre, "rb") as f:
+            if f.read() == contenido:
+                return
+    with open(nombre, "wb") as f:
+        f.write(contenido)
+
+
+def ejecutar_memorizado(
+    cache: Optional[CacheResultados],
+    funcion: Callable,
+    huella_datos: str,
+    obtener_df: Callable[[], pd.DataFrame],
+    *args,
+    **kwargs,
+):
+    """
+    Ejecuta `funcion(df, *args, **kwargs)` o reproduce su resultado guardado.
+
+    Si el resultado está en caché se reimprime su salida y se restauran los archivos que
+    declaró con `genera_archivos`, sin cargar el DataFrame ni recalcular. Si no, se ejecuta
+    la función capturando lo que imprime y se guarda el resultado.
+
+    Args:
+        cache (CacheResultados | None): Caché a usar; None ejecuta siempre la función.
+        funcion (Callable): Función de análisis que recibe el DataFrame como primer argumento.
+        huella_datos (str): Huella del dataset de entrada.
+        obtener_df (Callable): Devuelve el DataFrame; solo se llama si hay que calcular.
+    """
+    if cache is None:
+        funcion(obtener_df(), *args, **kwargs)
+        return
+
+    clave = clave_resultado(funcion, huella_datos, *args, **kwargs)
+    resultado = cache.obtener(clave)
+    if resultado is not None:
+        salida, archivos = resultado
+        sys.stdout.write(salida)
+        for nombre, contenido in archivos.items():
+            _restaurar_archivo(nombre, contenido)
+        return
+
+    df = obtener_df()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        funcion(df, *args, **kwargs)
+    salida = buffer.getvalue()
+    sys.stdout.write(salida)
+
+    archivos = {}
+    for nombre in getattr(funcion, "archivos_generados", ()):
+        with open(nombre, "rb") as f:
+            archivos[nombre] = f.read()
+    cache.guardar(clave, salida, archivos)
+
+
+def obtener_cache_resultados() -> Optional[CacheResultados]:
+    """Abre la caché de resultados configurada, o devuelve None si está desactivada."""
+    if not settings.usar_cache_analisis:
+        return None
+    return CacheResultados(settings.ruta_cache_analisis, settings.tamano_maximo_cache_analisis)
@@ -2,19 +2,36 @@
 
 import os
 import sys
-from typing import Optional
+import weakref
+from datetime import datetime
+from typing import Any, Callable, Optional
 
 import pandas as pd
 
 # Para poder importar de src.scraping
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
+from src.scraping.almacenamiento import Filtro, buscar_archivo_datos, cargar_dataframe
 from src.scraping.const import settings
+from src.scraping.datos_serie import SerieNullValues
+from src.scraping.perfilado import perfilar
 
+# Estructuras derivadas de cada DataFrame, por (id del DataFrame, clave)
+_cache_por_dataframe: dict[tuple[int, Any], Any] = {}
 
-def importar_data_frame() -> pd.DataFrame:
-    """Importa el DataFrame principal desde el archivo pickle configurado."""
-    return pd.read_pickle(settings.nombre_archivo_pkl)
+
+@perfilar
+def importar_data_frame(
+    columnas: Optional[list[str]] = None, filtros: Optional[list[Filtro]] = None
+) -> pd.DataFrame:
+    """
+    Importa el DataFrame principal desde el archivo de datos configurado (Parquet o pickle).
+
+    Si se indican columnas o filtros, con Parquet solo se leen esas columnas y filas del disco.
+    """
+    return cargar_dataframe(
+        buscar_archivo_datos(settings.nombre_base_datos), columnas=columnas, filtros=filtros
+    )
 
 
 def imprimir_data_frame(
@@ -44,17 +61,61 @@ def imprimir_data_frame(
         print(df.head(cantidad).to_markdown(index=False))
 
 
-def split_df(df: pd.DataFrame, columna: str) -> tuple[str, pd.DataFrame]:
-    """Separa los valores de una columna en listas y expande el DataFrame para tener una fila por cada elemento."""
-    COLUMNA_SPLIT = columna + "_split"
+def cache_por_dataframe(df: pd.DataFrame, clave: Any, construir: Callable[[], Any]) -> Any:
+    """
+    Devuelve la estructura derivada de `df` identificada por `clave`, construyéndola una sola vez.
+
+    La entrada se descarta automáticamente cuando el DataFrame deja de existir. Se asume que
+    el DataFrame no se modifica después de construir la estructura.
+    """
+    clave_cache = (id(df), clave)
+    if clave_cache not in _cache_por_dataframe:
+        _cache_por_dataframe[clave_cache] = construir()
+        weakref.finalize(df, _cache_por_dataframe.pop, clave_cache, None)
+    return _cache_por_dataframe[clave_cache]
+
+
+def mascara_anio_valido(df: pd.DataFrame, columna: str) -> pd.Series:
+    """Máscara de las filas cuyo año en `columna` es conocido, posterior a 1900 y no futuro."""
+    anios = df[columna]
+    return (
+        anios.notnull()
+        & (anios.astype(int) != SerieNullValues[columna.upper()].value)
+        & (anios.astype(int) > 1900)
+        & (anios.astype(int) <= datetime.now().year)
+    )
 
-    # Separar en listas
-    df[COLUMNA_SPLIT] = df[columna].str.split(",")
 
-    # Explode para tener una fila por cada elemento
-    df_exploded = df.explode(COLUMNA_SPLIT)
+def formato_largo(df: pd.DataFrame, columna: str) -> pd.Series:
+    """
+    Devuelve una columna multivalor ("Drama, Comedia") en formato largo: un valor por fila.
+
+    El resultado es una serie categórica indexada por la etiqueta de fila de cada serie en
+    `df`, de modo que cada valor distinto se guarda una sola vez en el diccionario de
+    categorías y cada fila solo ocupa un código entero. Se construye una vez por DataFrame
+    y columna y se reutiliza mientras el DataFrame exista.
+    """
+
+    def construir() -> pd.Series:
+        largo = df[columna].str.split(",").explode().str.strip().astype("category")
+        largo.name = columna + "_split"
+        return largo
+
+    return cache_por_dataframe(df, ("formato_largo", columna), construir)
+
+
+@perfilar
+def split_df(df: pd.DataFrame, columna: str) -> tuple[str, pd.DataFrame]:
+    """Separa los valores de una columna y expande el DataFrame para tener una fila por cada elemento.
+
+    Usa la tabla en formato largo cacheada de `formato_largo`, por lo que el texto de la
+    columna solo se separa la primera vez que se pide para un mismo DataFrame. La columna
+    separada es categórica: cada fila ocupa un código entero y no una copia del texto. Quien
+    necesite texto puede convertirla con `.astype(str)` sobre el resultado ya reducido.
+    """
+    largo = formato_largo(df, columna)
+    COLUMNA_SPLIT = largo.name
 
-    # Limpiar espacios extra
-    df_exploded[COLUMNA_SPLIT] = df_exploded[COLUMNA_SPLIT].str.strip()
+    df_exploded = df.join(largo)
 
     return COLUMNA_SPLIT, df_exploded
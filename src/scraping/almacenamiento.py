@@ -0,0 +1,192 @@
+"""Almacenamiento columnar (Parquet) del dataset de series, con pickle como respaldo."""
+
+import importlib.util
+import operator
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+
+import pandas as pd
+
+EXTENSION_PARQUET = ".parquet"
+EXTENSION_PICKLE = ".pkl"
+
+# Parquet requiere pyarrow (dependencia del proyecto); en un entorno sin él se usa pickle
+PARQUET_DISPONIBLE = importlib.util.find_spec("pyarrow") is not None
+EXTENSION_DATOS = EXTENSION_PARQUET if PARQUET_DISPONIBLE else EXTENSION_PICKLE
+
+Filtro = tuple[str, str, Any]
+
+_OPERADORES = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+OPERADORES_FILTRO = frozenset(_OPERADORES) | {"in", "not in"}
+
+
+def guardar_dataframe(df: pd.DataFrame, archivo: str):
+    """Guarda el DataFrame en el formato indicado por la extensión del archivo.
+
+    En Parquet las columnas de texto se guardan con codificación de diccionario y compresión
+    zstd, por lo que valores repetidos como géneros o plataformas ocupan muy poco.
+
+    Args:
+        df (pd.DataFrame): DataFrame a guardar.
+        archivo (str): Ruta de destino, terminada en `.parquet` o `.pkl`.
+    """
+    if archivo.endswith(EXTENSION_PARQUET):
+        df.to_parquet(
+            archivo, engine="pyarrow", index=False, compression="zstd", use_dictionary=True
+        )
+    else:
+        with open(archivo, "wb") as f:
+            pickle.dump(df, f)
+
+
+class EscritorPorLotes:
+    """Escribe un DataFrame por partes en un archivo, reemplazando el destino de forma atómica.
+
+    Con Parquet cada lote se escribe como un row group apenas llega, por lo que la memoria
+    no depende del tamaño total. Con pickle los lotes se acumulan y se escriben al cerrar.
+    El archivo final solo aparece al llamar a `cerrar`; hasta entonces se escribe en un
+    temporal del mismo directorio.
+
+    Uso:
+        with EscritorPorLotes("series_tv.parquet") as escritor:
+            escritor.escribir(df_lote)
+    """
+
+    def __init__(self, archivo: str):
+        """Prepara el archivo temporal de escritura."""
+        self.archivo = archivo
+        self.filas = 0
+        extension = os.path.splitext(archivo)[1]
+        descriptor, self._temporal = tempfile.mkstemp(
+            suffix=extension, prefix=".tmp_", dir=os.path.dirname(os.path.abspath(archivo))
+        )
+        os.close(descriptor)
+        self._parquet = archivo.endswith(EXTENSION_PARQUET)
+        self._escritor_parquet: Any = None
+        self._esquema: Any = None
+        self._lotes: list[pd.DataFrame] = []
+
+    def escribir(self, df: pd.DataFrame):
+        """Agrega un lote de filas al archivo."""
+        if df.empty:
+            return
+        self.filas += len(df)
+        if not self._parquet:
+            self._lotes.append(df)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._escritor_parquet is None:
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            self._esquema = tabla.schema
+            self._escritor_parquet = pq.ParquetWriter(
+                self._temporal, self._esquema, compression="zstd", use_dictionary=True
+            )
+        else:
+            tabla = pa.Table.from_pandas(df, schema=self._esquema, preserve_index=False)
+        self._escritor_parquet.write_table(tabla)
+
+    def cerrar(self):
+        """Termina la escritura y mueve el temporal al destino definitivo."""
+        if self._parquet:
+            if self._escritor_parquet is not None:
+                self._escritor_parquet.close()
+            else:
+                pd.DataFrame().to_parquet(self._temporal, engine="pyarrow")
+        else:
+            df = pd.concat(self._lotes, ignore_index=True) if self._lotes else pd.DataFrame()
+            self._lotes = []
+            with open(self._temporal, "wb") as f:
+                pickle.dump(df, f)
+        os.replace(self._temporal, self.archivo)
+
+    def abortar(self):
+        """Descarta lo escrito sin tocar el archivo de destino."""
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+        self._lotes = []
+        if os.path.exists(self._temporal):
+            os.remove(self._temporal)
+
+    def __enter__(self):
+        """Permite usar el escritor con `with`."""
+        return self
+
+    def __exit__(self, tipo_excepcion, *exc):
+        """Cierra el escritor, o lo aborta si hubo una excepción."""
+        if tipo_excepcion is None:
+            self.cerrar()
+        else:
+            self.abortar()
+
+
+def cargar_dataframe(
+    archivo: str,
+    columnas: Optional[list[str]] = None,
+    filtros: Optional[list[Filtro]] = None,
+) -> pd.DataFrame:
+    """Carga el dataset, leyendo solo las columnas y filas pedidas.
+
+    Con Parquet la proyección de columnas y los filtros se aplican al leer (pushdown), sin
+    materializar el resto del archivo. Con pickle se carga todo y luego se filtra.
+
+    Args:
+        archivo (str): Ruta del archivo `.parquet` o `.pkl`.
+        columnas (Optional[list[str]]): Columnas a cargar. Por defecto todas.
+        filtros (Optional[list[Filtro]]): Condiciones `(columna, operador, valor)` que deben
+            cumplirse todas. Operadores: `==`, `!=`, `<`, `<=`, `>`, `>=`, `in`, `not in`.
+
+    Returns:
+        pd.DataFrame: Dataset cargado.
+    """
+    if archivo.endswith(EXTENSION_PARQUET):
+        return pd.read_parquet(archivo, engine="pyarrow", columns=columnas, filters=filtros)
+
+    df = aplicar_filtros(pd.read_pickle(archivo), filtros or [])
+    if columnas is not None:
+        df = df[columnas]
+    return df
+
+
+def aplicar_filtros(df: pd.DataFrame, filtros: list[Filtro]) -> pd.DataFrame:
+    """Devuelve las filas de `df` que cumplen todas las condiciones `(columna, operador, valor)`."""
+    if not filtros:
+        return df
+    mascara = pd.Series(True, index=df.index)
+    for columna, operador, valor in filtros:
+        if operador == "in":
+            mascara &= df[columna].isin(valor)
+        elif operador == "not in":
+            mascara &= ~df[columna].isin(valor)
+        else:
+            mascara &= _OPERADORES[operador](df[columna], valor)
+    return df[mascara]
+
+
+def buscar_archivo_datos(nombre_base: str) -> str:
+    """Devuelve el archivo existente del dataset, prefiriendo Parquet sobre pickle.
+
+    Args:
+        nombre_base (str): Ruta sin extensión, por ejemplo `series_tv`.
+
+    Returns:
+        str: Ruta con extensión. Si no existe ninguno se devuelve la del formato por defecto.
+    """
+    for extension in (EXTENSION_PARQUET, EXTENSION_PICKLE):
+        if extension == EXTENSION_PARQUET and not PARQUET_DISPONIBLE:
+            continue
+        if os.path.exists(nombre_base + extension):
+            return nombre_base + extension
+    return nombre_base + EXTENSION_DATOS
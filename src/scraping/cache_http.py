@@ -0,0 +1,157 @@
+"""Caché persistente en disco de respuestas HTTP con revalidación condicional."""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from const import settings
+
+
+@dataclass
+class EntradaCache:
+    """Respuesta guardada en caché junto a sus cabeceras de validación."""
+
+    url: str
+    contenido: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    guardado: float
+
+    def vigente(self, ttl: float) -> bool:
+        """Indica si la entrada puede usarse sin revalidar con el servidor."""
+        return time.time() - self.guardado < ttl
+
+    def cabeceras_condicionales(self) -> dict[str, str]:
+        """Devuelve las cabeceras `If-None-Match`/`If-Modified-Since` para revalidar."""
+        cabeceras = {}
+        if self.etag:
+            cabeceras["If-None-Match"] = self.etag
+        if self.last_modified:
+            cabeceras["If-Modified-Since"] = self.last_modified
+        return cabeceras
+
+
+class CacheHTTP:
+    """Caché de respuestas indexada por URL sobre SQLite, con TTL y desalojo LRU por tamaño."""
+
+    def __init__(self, ruta: str, ttl: float, tamano_maximo: int):
+        """Abre (o crea) la base de datos de la caché.
+
+        Args:
+            ruta (str): Archivo SQLite donde se guardan las respuestas.
+            ttl (float): Segundos durante los que una entrada se usa sin revalidar.
+            tamano_maximo (int): Bytes máximos de contenido antes de desalojar entradas.
+        """
+        self.ttl = ttl
+        self.tamano_maximo = tamano_maximo
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS respuestas (
+                url TEXT PRIMARY KEY,
+                contenido BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                guardado REAL NOT NULL,
+                accedido REAL NOT NULL,
+                tamano INTEGER NOT NULL
+            )
+            """)
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_respuestas_accedido ON respuestas (accedido)"
+        )
+        self._conexion.commit()
+        self._tamano_total = self._conexion.execute(
+            "SELECT COALESCE(SUM(tamano), 0) FROM respuestas"
+        ).fetchone()[0]
+
+    def obtener(self, url: str) -> Optional[EntradaCache]:
+        """Devuelve la entrada guardada para la URL, o None si no existe."""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT contenido, etag, last_modified, guardado FROM respuestas WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if fila is None:
+                return None
+            self._conexion.execute(
+                "UPDATE respuestas SET accedido = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conexion.commit()
+        return EntradaCache(url, *fila)
+
+    def guardar(
+        self, url: str, contenido: bytes, etag: Optional[str], last_modified: Optional[str]
+    ):
+        """Guarda (o reemplaza) la respuesta de una URL y desaloja si se supera el tamaño."""
+        ahora = time.time()
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT tamano FROM respuestas WHERE url = ?", (url,)
+            ).fetchone()
+            if fila is not None:
+                self._tamano_total -= fila[0]
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, contenido, etag, last_modified, ahora, ahora, len(contenido)),
+            )
+            self._tamano_total += len(contenido)
+            self._desalojar()
+            self._conexion.commit()
+
+    def renovar(self, url: str):
+        """Marca como recién validada una entrada tras recibir un 304 Not Modified."""
+        ahora = time.time()
+        with self._lock:
+            self._conexion.execute(
+                "UPDATE respuestas SET guardado = ?, accedido = ? WHERE url = ?",
+                (ahora, ahora, url),
+            )
+            self._conexion.commit()
+
+    def _desalojar(self):
+        """Elimina las entradas menos usadas recientemente hasta respetar el tamaño máximo."""
+        while self._tamano_total > self.tamano_maximo:
+            fila = self._conexion.execute(
+                "SELECT url, tamano FROM respuestas ORDER BY accedido LIMIT 1"
+            ).fetchone()
+            if fila is None:
+                break
+            self._conexion.execute("DELETE FROM respuestas WHERE url = ?", (fila[0],))
+            self._tamano_total -= fila[1]
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conexion.close()
+
+
+_cache: Optional[CacheHTTP] = None
+_lock_cache = threading.Lock()
+
+
+def obtener_cache() -> Optional[CacheHTTP]:
+    """Devuelve la caché compartida del proceso, o None si está desactivada en `settings`."""
+    global _cache
+    if not settings.usar_cache_http:
+        return None
+    if _cache is None:
+        with _lock_cache:
+            if _cache is None:
+                _cache = CacheHTTP(
+                    ruta=settings.ruta_cache_http,
+                    ttl=settings.ttl_cache_http,
+                    tamano_maximo=settings.tamano_maximo_cache_http,
+                )
+    return _cache
+
+
+def cerrar_cache():
+    """Cierra la caché compartida, si estaba abierta."""
+    global _cache
+    with _lock_cache:
+        if _cache is not None:
+            _cache.cerrar()
+            _cache = None
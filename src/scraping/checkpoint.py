@@ -0,0 +1,126 @@
+"""Estado persistente del crawl para poder reanudarlo tras una interrupción."""
+
+import dataclasses
+import json
+import sqlite3
+import threading
+from typing import Iterator, Optional
+
+from datos_serie import DatosSerie
+
+PENDIENTE = "pendiente"
+COMPLETA = "completa"
+FALLIDA = "fallida"
+
+
+class Checkpoint:
+    """Registro en SQLite de las páginas leídas y del estado de extracción de cada serie.
+
+    Cada cambio se confirma de inmediato, de modo que si el proceso muere solo se pierde la
+    serie que se estaba procesando en ese momento.
+    """
+
+    def __init__(self, ruta: str):
+        """Abre (o crea) el archivo de checkpoint.
+
+        Args:
+            ruta (str): Archivo SQLite donde se guarda el estado del crawl.
+        """
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS paginas (numero INTEGER PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS series (
+                link TEXT PRIMARY KEY,
+                estado TEXT NOT NULL,
+                datos TEXT NOT NULL
+            );
+            """)
+        self._conexion.commit()
+
+    def ultima_pagina(self) -> Optional[int]:
+        """Devuelve el número de la última página de listado ya registrada, o None."""
+        with self._lock:
+            return self._conexion.execute("SELECT MAX(numero) FROM paginas").fetchone()[0]
+
+    def registrar_pagina(self, numero: int, series: list[DatosSerie]) -> list[DatosSerie]:
+        """Registra una página de listado y sus series.
+
+        Returns:
+            list[DatosSerie]: Las series de la página que no estaban registradas antes.
+        """
+        with self._lock:
+            nuevas = []
+            for serie in series:
+                cursor = self._conexion.execute(
+                    "INSERT OR IGNORE INTO series VALUES (?, ?, ?)",
+                    (serie.link, PENDIENTE, _serializar(serie)),
+                )
+                if cursor.rowcount:
+                    nuevas.append(serie)
+            self._conexion.execute("INSERT OR IGNORE INTO paginas VALUES (?)", (numero,))
+            self._conexion.commit()
+        return nuevas
+
+    def registrar_resultado(self, serie: DatosSerie):
+        """Guarda los datos extraídos de una serie, marcándola como completa o fallida.
+
+        La fila se actualiza en su lugar para conservar el rowid con que se descubrió la serie,
+        del que dependen el orden de `series` y el recorrido por bloques de `series_completas`.
+        """
+        estado = COMPLETA if serie.fecha_extraccion is not None else FALLIDA
+        datos = _serializar(serie)
+        with self._lock:
+            cursor = self._conexion.execute(
+                "UPDATE series SET estado = ?, datos = ? WHERE link = ?",
+                (estado, datos, serie.link),
+            )
+            if not cursor.rowcount:
+                self._conexion.execute(
+                    "INSERT INTO series VALUES (?, ?, ?)", (serie.link, estado, datos)
+                )
+            self._conexion.commit()
+
+    def series_pendientes(self) -> list[DatosSerie]:
+        """Devuelve las series registradas cuya extracción no ha terminado con éxito."""
+        return self._leer_series("WHERE estado != ?", (COMPLETA,))
+
+    def series_completas(self, tamano_bloque: int = 1000) -> Iterator[DatosSerie]:
+        """Recorre las series ya completas sin cargarlas todas a la vez en memoria."""
+        ultimo_rowid = 0
+        while True:
+            with self._lock:
+                filas = self._conexion.execute(
+                    "SELECT rowid, datos FROM series WHERE estado = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (COMPLETA, ultimo_rowid, tamano_bloque),
+                ).fetchall()
+            if not filas:
+                return
+            ultimo_rowid = filas[-1][0]
+            for _, datos in filas:
+                yield DatosSerie(**json.loads(datos))
+
+    def series(self) -> list[DatosSerie]:
+        """Devuelve todas las series registradas, en el orden en que se descubrieron."""
+        return self._leer_series()
+
+    def _leer_series(self, condicion: str = "", parametros: tuple = ()) -> list[DatosSerie]:
+        with self._lock:
+            filas = self._conexion.execute(
+                f"SELECT datos FROM series {condicion} ORDER BY rowid", parametros
+            ).fetchall()
+        return [DatosSerie(**json.loads(fila[0])) for fila in filas]
+
+    def cerrar(self):
+        """Cierra la conexión con el archivo de checkpoint."""
+        with self._lock:
+            self._conexion.close()
+
+
+def _serializar(serie: DatosSerie) -> str:
+    """Convierte una serie en JSON para guardarla en el checkpoint."""
+    return json.dumps(dataclasses.asdict(serie), ensure_ascii=False)
@@ -1,6 +1,8 @@
 """Constantes y configuración para el scraping de series de TV."""
 
+import os
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -15,6 +17,82 @@ class AppSettings:
         return self.base_url + "series-tv/"
 
     nombre_archivo_pkl: str = "series_tv.pkl"
+    hilos_fusion: int = 4
+
+    @property
+    def nombre_base_datos(self):
+        """Devuelve el nombre del archivo de datos sin extensión (el formato se elige al guardar)."""
+        return os.path.splitext(self.nombre_archivo_pkl)[0]
+
+    # Concurrencia en la extracción de datos de las series
+    max_workers_detalle: int = 8
+    max_conexiones_por_host: int = 4
+    profundidad_cola_detalle: int = 100
+    ventana_paginas_listado: int = 4
+
+    # Backend de parseo HTML ("lxml" si está instalado, si no se usa "html.parser")
+    parser_html: str = "lxml"
+
+    # Procesos que parsean las páginas de detalle (None usa uno por núcleo; 0 parsea en los
+    # mismos hilos de descarga)
+    procesos_parseo: Optional[int] = None
+
+    # Límite de tasa (0 lo desactiva), reintentos con backoff y concurrencia adaptativa
+    peticiones_por_segundo: float = 10.0
+    rafaga_peticiones: int = 10
+    max_reintentos: int = 4
+    espera_base_reintento: float = 1.0
+    espera_maxima_reintento: float = 60.0
+    latencia_objetivo: float = 2.0
+    reintentos_pagina_listado: int = 3
+
+    # Pool de conexiones HTTP y timeouts (en segundos)
+    pools_por_host: int = 4
+    tamano_pool_conexiones: int = 8
+    timeout_conexion: float = 5.0
+    timeout_lectura: float = 30.0
+
+    # Exportación en streaming: series por lote y formato del archivo de salida
+    # (".parquet", ".pkl", ".jsonl" o ".sqlite3"; None usa el formato por defecto)
+    tamano_lote_exportacion: int = 200
+    extension_salida: Optional[str] = None
+
+    # Telemetría del crawl: endpoint Prometheus (puerto, None lo desactiva) e instantáneas
+    # JSON periódicas (archivo, None lo desactiva; intervalo en segundos)
+    telemetria: bool = False
+    puerto_metricas: Optional[int] = None
+    archivo_metricas: Optional[str] = "metricas_crawl.json"
+    intervalo_metricas: float = 10.0
+
+    # Perfilado del scraping y del análisis: tiempos y pico de memoria por etapa, llamadas a
+    # las funciones costosas y muestreo de pilas (segundos entre muestras)
+    perfilado: bool = False
+    directorio_perfilado: str = "perfiles"
+    intervalo_muestreo_perfilado: float = 0.005
+
+    # Crawl distribuido: páginas de listado por lease, segundos de validez de un lease sin
+    # latidos, segundos entre latidos e intentos antes de dar una serie por fallida
+    paginas_por_lease: int = 10
+    duracion_lease: float = 120.0
+    intervalo_latido: float = 15.0
+    max_intentos_lease: int = 3
+
+    # Sufijo del archivo de checkpoint que permite reanudar un crawl interrumpido
+    sufijo_checkpoint: str = ".checkpoint.sqlite3"
+
+    # Re-scraping incremental: días tras los que se vuelve a extraer una serie
+    dias_antiguedad_incremental: float = 7.0
+
+    # Caché HTTP en disco (TTL en segundos, tamaño máximo en bytes)
+    usar_cache_http: bool = True
+    ruta_cache_http: str = "cache_http.sqlite3"
+    ttl_cache_http: float = 6 * 60 * 60
+    tamano_maximo_cache_http: int = 512 * 1024 * 1024
+
+    # Caché en disco de los resultados del análisis (tamaño máximo en bytes)
+    usar_cache_analisis: bool = True
+    ruta_cache_analisis: str = "cache_analisis.sqlite3"
+    tamano_maximo_cache_analisis: int = 64 * 1024 * 1024
 
 
 settings = AppSettings()
@@ -1,20 +1,92 @@
 """Funciones para manipular y guardar DataFrames de series de TV."""
 
 import pickle
+from operator import attrgetter
+from typing import Iterable
 
 import pandas as pd
 from datos_serie import DatosSerie, SerieColumn, SerieNullValues
+from perfilado import perfilar
 
+# Columnas que en DatosSerie son tuplas y en el DataFrame se guardan como texto "a, b, c"
+COLUMNAS_LISTA = (SerieColumn.GENEROS.value, SerieColumn.DONDE_VER.value)
 
+
+def _normalizar_lista_texto(valores: pd.Series, null_value: str) -> pd.Series:
+    """
+    Normaliza una columna de listas representadas como texto.
+
+    Los textos no vacíos se mantienen, las listas y tuplas se unen con ", " (las vacías y None
+    pasan a `null_value`) y cualquier otro valor se convierte a texto.
+    """
+    tipos = valores.map(type).to_numpy()
+    es_texto = tipos == str
+    if es_texto.all() and valores.dtype != object:
+        return valores
+
+    es_lista = (tipos == tuple) | (tipos == list)
+    es_nulo = tipos == type(None)
+    resultado = valores.to_numpy(dtype=object, copy=True)
+    if es_lista.any():
+        listas = valores[es_lista]
+        unidas = listas.str.join(", ").where(listas.str.len() > 0, null_value)
+        resultado[es_lista] = unidas.to_numpy(dtype=object)
+    resultado[es_nulo] = null_value
+    otros = ~(es_texto | es_lista | es_nulo)
+    if otros.any():
+        resultado[otros] = valores[otros].map(str).to_numpy(dtype=object)
+    return pd.Series(resultado, index=valores.index, name=valores.name)
+
+
+class LoteSeries:
+    """
+    Contenedor columnar de series: guarda una lista de valores por columna en lugar de un
+    objeto por serie, y se convierte a DataFrame sin construir un diccionario por serie.
+    """
+
+    def __init__(self, series: Iterable[DatosSerie] = ()):
+        """Crea el lote, opcionalmente con unas series iniciales."""
+        self._columnas: dict[str, list] = {columna.value: [] for columna in SerieColumn}
+        self._valores = attrgetter(*self._columnas)
+        self.extender(series)
+
+    def agregar(self, serie: DatosSerie):
+        """Agrega una serie al lote."""
+        for valores, valor in zip(self._columnas.values(), self._valores(serie)):
+            valores.append(valor)
+
+    def extender(self, series: Iterable[DatosSerie]):
+        """Agrega varias series al lote, columna por columna."""
+        series = series if isinstance(series, list) else list(series)
+        for nombre, valores in self._columnas.items():
+            valores.extend(map(attrgetter(nombre), series))
+
+    def __len__(self) -> int:
+        return len(self._columnas[SerieColumn.LINK.value])
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """
+        Construye el DataFrame del lote, reemplazando los None por el valor nulo de
+        `SerieNullValues`. Las columnas de géneros y plataformas quedan ya normalizadas
+        como en `limpiar_dataframe`.
+        """
+        columnas = {}
+        for columna in SerieColumn:
+            nulo = SerieNullValues[columna.name].value
+            valores = [nulo if v is None else v for v in self._columnas[columna.value]]
+            if columna.value in COLUMNAS_LISTA:
+                valores = _normalizar_lista_texto(pd.Series(valores, dtype=object), nulo)
+            columnas[columna.value] = valores
+        return pd.DataFrame(columnas)
+
+
+@perfilar
 def datos_series_a_dataframe(series: list[DatosSerie]) -> pd.DataFrame:
-    """Convierte una lista de DatosSerie en un DataFrame de pandas."""
-    data = []
-    for s in series:
-        data.append(s.to_dict())
-    df = pd.DataFrame(data)
-    return df
+    """Convierte una lista de DatosSerie en un DataFrame de pandas (ver `LoteSeries`)."""
+    return LoteSeries(series).a_dataframe()
 
 
+@perfilar
 def limpiar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Realiza limpieza básica del DataFrame usando los campos del dataclass."""
     for field in DatosSerie.__dataclass_fields__:
@@ -24,27 +96,8 @@ def limpiar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             SerieColumn.TITULO_ORIGINAL.value,
         ):
             df[field] = df[field].fillna(null_value).astype(str).str.strip()
-        elif field in (SerieColumn.GENEROS.value, SerieColumn.DONDE_VER.value):
-            # Normaliza listas representadas como string
-            df[field] = df[field].apply(
-                lambda x: (
-                    x
-                    if isinstance(x, str) and x  # Y no esta vacio
-                    else (
-                        null_value
-                        if isinstance(x, list) and not x  # Lista vacia
-                        else (
-                            ", ".join(x)
-                            if isinstance(x, list)
-                            else (
-                                str(x)
-                                if x is not None  # El "" se considera como None
-                                else null_value
-                            )
-                        )
-                    )
-                )
-            )
+        elif field in COLUMNAS_LISTA:
+            df[field] = _normalizar_lista_texto(df[field], null_value)
         elif field in (
             SerieColumn.FECHA_EMISION_ORIGINAL.value,
             SerieColumn.FECHA_EMISION_ULTIMA.value,
@@ -57,6 +110,10 @@ def limpiar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             df[field] = pd.to_numeric(df[field], errors="coerce").fillna(null_value).astype(int)
         elif field == SerieColumn.PUNTUACION.value:
             df[field] = pd.to_numeric(df[field], errors="coerce").fillna(null_value)
+        elif field == SerieColumn.FECHA_EXTRACCION.value:
+            if field not in df:
+                df[field] = null_value  # Datos guardados antes de existir esta columna
+            df[field] = pd.to_numeric(df[field], errors="coerce").fillna(null_value).astype(float)
         elif field == SerieColumn.LINK.value:
             df[field] = df[field].fillna(null_value).astype(str).str.strip()
     return df
@@ -1,8 +1,9 @@
 """Definición de la clase DatosSerie para almacenar información de series de TV."""
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 
 import pandas as pd
 
@@ -20,6 +21,7 @@ class SerieColumn(Enum):
     FECHA_EMISION_ULTIMA = "fecha_emision_ultima"
     PUNTUACION = "puntuacion"
     DONDE_VER = "donde_ver"
+    FECHA_EXTRACCION = "fecha_extraccion"
 
 
 class SerieNullValues(Enum):
@@ -35,23 +37,52 @@ class SerieNullValues(Enum):
     FECHA_EMISION_ULTIMA = 0
     PUNTUACION = pd.NA
     DONDE_VER = "No disponible"
+    FECHA_EXTRACCION = 0.0
 
 
-@dataclass
+# Tuplas de valores ya vistas, para que las series con los mismos géneros o plataformas
+# compartan una única tupla (y los mismos strings) en memoria
+_tuplas_internadas: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def internar_valores(valores: Optional[Iterable[str]]) -> Optional[tuple[str, ...]]:
+    """
+    Convierte una lista de géneros/plataformas en una tupla compartida de strings internados.
+
+    Un texto (datos antiguos con los valores ya unidos) o None se devuelven sin cambios.
+    """
+    if valores is None or isinstance(valores, str):
+        return valores
+    tupla = tuple(sys.intern(v) for v in valores)
+    return _tuplas_internadas.setdefault(tupla, tupla)
+
+
+@dataclass(slots=True)
 class DatosSerie:
-    """Modelo de datos para almacenar información relevante de una serie de TV."""
+    """
+    Modelo de datos para almacenar información relevante de una serie de TV.
+
+    Usa `__slots__` y guarda géneros y plataformas como tuplas internadas (ver
+    `internar_valores`), ya que un crawl mantiene todas las series en memoria hasta el final.
+    """
 
     link: str
 
     titulo: Optional[str] = None
     titulo_original: Optional[str] = None
-    generos: Optional[list[str]] = field(default_factory=list)
+    generos: Optional[tuple[str, ...]] = ()
     cantidad_temporadas: Optional[int] = None
     cantidad_episodios_totales: Optional[int] = None
     fecha_emision_original: Optional[int] = None
     fecha_emision_ultima: Optional[int] = None
     puntuacion: Optional[float] = None
-    donde_ver: Optional[list[str]] = field(default_factory=list)
+    donde_ver: Optional[tuple[str, ...]] = ()
+    fecha_extraccion: Optional[float] = None  # Timestamp Unix de la última extracción exitosa
+
+    def __post_init__(self):
+        """Interna los géneros y plataformas recibidos como lista (p. ej. desde un checkpoint)."""
+        self.generos = internar_valores(self.generos)
+        self.donde_ver = internar_valores(self.donde_ver)
 
     def to_dict(self):
         """Convierte el objeto DatosSerie en un diccionario usando los campos del dataclass y valores nulos del Enum."""
@@ -62,7 +93,7 @@ class DatosSerie:
             if value is None:
                 value = SerieNullValues[field.upper()].value
             if field in (SerieColumn.GENEROS.value, SerieColumn.DONDE_VER.value):
-                value = ", ".join(value) if isinstance(value, list) and value else value
+                value = ", ".join(value) if isinstance(value, (list, tuple)) and value else value
             result[field] = value
         return result
 
@@ -0,0 +1,469 @@
+"""Crawl distribuido: un coordinador reparte el trabajo en leases y varios trabajadores lo ejecutan.
+
+El estado se guarda en una cola SQLite compartida. El coordinador crea leases de bloques de
+páginas de listado y guarda en la cola el sitio a recorrer (`--base-url`); al leer un bloque, el trabajador agrega un lease por cada serie nueva
+(deduplicadas por `link`). Cada trabajador reclama leases, renueva su vencimiento con latidos
+mientras los procesa y, si muere, sus leases vencen y otro trabajador los retoma. Cuando no
+queda trabajo, el coordinador exporta los resultados a un único archivo.
+
+Uso:
+    python src/scraping/distribuido.py coordinar --cola crawl.sqlite3 --desde 1 --hasta 150
+    python src/scraping/distribuido.py trabajar --cola crawl.sqlite3   # en cada nodo/proceso
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from almacenamiento import EXTENSION_DATOS
+from cache_http import cerrar_cache
+from const import settings
+from datos_serie import DatosSerie
+from exportacion import ExportadorStreaming, crear_sumidero
+from extraer_datos import extraer_datos_de_serie
+from listado import scraping_obtener_links_series
+from pool_parseo import cerrar_pool_parseo
+from sesion import cerrar_sesion
+from telemetria import detener_telemetria, iniciar_telemetria
+
+PAGINAS = "paginas"
+SERIE = "serie"
+
+PENDIENTE = "pendiente"
+ASIGNADO = "asignado"
+COMPLETO = "completo"
+FALLIDO = "fallido"
+
+
+@dataclasses.dataclass
+class Lease:
+    """Unidad de trabajo reclamada por un trabajador."""
+
+    id: int
+    tipo: str
+    clave: str
+    datos: dict
+    intentos: int
+
+
+class ColaTrabajos:
+    """Cola de leases sobre SQLite, compartida por el coordinador y los trabajadores.
+
+    Cada operación es una transacción corta, por lo que varios procesos pueden usarla a la vez.
+    La cola usa el journal de rollback y no WAL: WAL necesita memoria compartida entre los
+    procesos y solo funciona en un mismo host, mientras que el journal de rollback se
+    coordina con bloqueos de archivo, así que la cola también puede compartirse entre
+    máquinas a través de un sistema de archivos de red con bloqueos POSIX (p. ej. NFS).
+    """
+
+    def __init__(self, ruta: str):
+        """Abre (o crea) la cola.
+
+        Args:
+            ruta (str): Archivo SQLite de la cola.
+        """
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(
+            ruta, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        # Se fija explícitamente: el modo WAL de una cola creada antes persistiría en el archivo
+        self._conexion.execute("PRAGMA journal_mode=DELETE")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS leases (
+                id INTEGER PRIMARY KEY,
+                tipo TEXT NOT NULL,
+                clave TEXT NOT NULL UNIQUE,
+                datos TEXT NOT NULL,
+                estado TEXT NOT NULL,
+                trabajador TEXT,
+                vence REAL,
+                intentos INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_leases_estado ON leases (estado, id);
+            CREATE TABLE IF NOT EXISTS resultados (link TEXT PRIMARY KEY, datos TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS metadatos (clave TEXT PRIMARY KEY, valor TEXT);
+            """)
+
+    def _transaccion(self):
+        """Abre una transacción que bloquea la escritura de otros procesos hasta terminar."""
+        self._conexion.execute("BEGIN IMMEDIATE")
+
+    def agregar(self, tipo: str, clave: str, datos: dict) -> bool:
+        """Agrega un lease pendiente si no existe otro con la misma clave.
+
+        Returns:
+            bool: True si el lease es nuevo.
+        """
+        with self._lock:
+            cursor = self._conexion.execute(
+                "INSERT OR IGNORE INTO leases (tipo, clave, datos, estado) VALUES (?, ?, ?, ?)",
+                (tipo, clave, json.dumps(datos, ensure_ascii=False), PENDIENTE),
+            )
+            return cursor.rowcount > 0
+
+    def reclamar(self, trabajador: str, duracion: float) -> Optional[Lease]:
+        """Asigna al trabajador el lease pendiente (o vencido) más antiguo.
+
+        Los leases de páginas tienen prioridad, para descubrir series cuanto antes.
+
+        Returns:
+            Optional[Lease]: El lease reclamado, o None si no hay ninguno disponible.
+        """
+        ahora = time.time()
+        with self._lock:
+            self._transaccion()
+            try:
+                fila = self._conexion.execute(
+                    "SELECT id, tipo, clave, datos, intentos FROM leases "
+                    "WHERE estado = ? OR (estado = ? AND vence < ?) "
+                    "ORDER BY tipo != ?, id LIMIT 1",
+                    (PENDIENTE, ASIGNADO, ahora, PAGINAS),
+                ).fetchone()
+                if fila is not None:
+                    self._conexion.execute(
+                        "UPDATE leases SET estado = ?, trabajador = ?, vence = ?, "
+                        "intentos = intentos + 1 WHERE id = ?",
+                        (ASIGNADO, trabajador, ahora + duracion, fila[0]),
+                    )
+                self._conexion.execute("COMMIT")
+            except BaseException:
+                self._conexion.execute("ROLLBACK")
+                raise
+        if fila is None:
+            return None
+        return Lease(fila[0], fila[1], fila[2], json.loads(fila[3]), fila[4] + 1)
+
+    def renovar(self, trabajador: str, duracion: float):
+        """Extiende el vencimiento de todos los leases asignados al trabajador (latido)."""
+        with self._lock:
+            self._conexion.execute(
+                "UPDATE leases SET vence = ? WHERE estado = ? AND trabajador = ?",
+                (time.time() + duracion, ASIGNADO, trabajador),
+            )
+
+    def completar(self, lease: Lease, trabajador: str, resultado: Optional[DatosSerie] = None):
+        """Marca el lease como completo y guarda el resultado, si lo hay.
+
+        Si el lease venció y ya lo reclamó otro trabajador, el resultado se guarda igual
+        (es la misma serie) pero el lease queda en manos del nuevo dueño.
+        """
+        with self._lock:
+            self._transaccion()
+            try:
+                if resultado is not None:
+                    self._conexion.execute(
+                        "INSERT OR REPLACE INTO resultados VALUES (?, ?)",
+                        (resultado.link, _serializar(resultado)),
+                    )
+                self._conexion.execute(
+                    "UPDATE leases SET estado = ?, vence = NULL WHERE id = ? AND trabajador = ?",
+                    (COMPLETO, lease.id, trabajador),
+                )
+                self._conexion.execute("COMMIT")
+            except BaseException:
+                self._conexion.execute("ROLLBACK")
+                raise
+
+    def liberar(
+        self,
+        lease: Lease,
+        trabajador: str,
+        max_intentos: int,
+        resultado: Optional[DatosSerie] = None,
+    ):
+        """Devuelve un lease fallido a la cola, o lo da por fallido si agotó sus intentos.
+
+        Si se da por fallido y se entrega un resultado, este se guarda igual: se conserva lo
+        que se sabe de la serie, como en el pipeline local.
+        """
+        fallido = lease.intentos >= max_intentos
+        with self._lock:
+            self._transaccion()
+            try:
+                if fallido and resultado is not None:
+                    self._conexion.execute(
+                        "INSERT OR IGNORE INTO resultados VALUES (?, ?)",
+                        (resultado.link, _serializar(resultado)),
+                    )
+                self._conexion.execute(
+                    "UPDATE leases SET estado = ?, trabajador = NULL, vence = NULL "
+                    "WHERE id = ? AND trabajador = ?",
+                    (FALLIDO if fallido else PENDIENTE, lease.id, trabajador),
+                )
+                self._conexion.execute("COMMIT")
+            except BaseException:
+                self._conexion.execute("ROLLBACK")
+                raise
+
+    def contar(self) -> dict[str, int]:
+        """Devuelve la cantidad de leases en cada estado."""
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT estado, COUNT(*) FROM leases GROUP BY estado"
+            ).fetchall()
+        return dict(filas)
+
+    def terminado(self) -> bool:
+        """Indica si no quedan leases pendientes ni asignados."""
+        conteo = self.contar()
+        return bool(conteo) and not conteo.get(PENDIENTE) and not conteo.get(ASIGNADO)
+
+    def leer_metadato(self, clave: str) -> Optional[str]:
+        """Devuelve un valor guardado por el coordinador o los trabajadores."""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT valor FROM metadatos WHERE clave = ?", (clave,)
+            ).fetchone()
+        return None if fila is None else fila[0]
+
+    def guardar_metadato(self, clave: str, valor: str):
+        """Guarda un valor compartido (p. ej. la última página del catálogo)."""
+        with self._lock:
+            self._conexion.execute("INSERT OR REPLACE INTO metadatos VALUES (?, ?)", (clave, valor))
+
+    def resultados(self, tamano_bloque: int = 1000) -> Iterator[DatosSerie]:
+        """Recorre las series extraídas sin cargarlas todas a la vez en memoria."""
+        ultimo_rowid = 0
+        while True:
+            with self._lock:
+                filas = self._conexion.execute(
+                    "SELECT rowid, datos FROM resultados WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (ultimo_rowid, tamano_bloque),
+                ).fetchall()
+            if not filas:
+                return
+            ultimo_rowid = filas[-1][0]
+            for _, datos in filas:
+                yield DatosSerie(**json.loads(datos))
+
+    def cerrar(self):
+        """Cierra la conexión con la cola."""
+        with self._lock:
+            self._conexion.close()
+
+
+def _serializar(serie: DatosSerie) -> str:
+    """Convierte una serie en JSON para guardarla en la cola."""
+    return json.dumps(dataclasses.asdict(serie), ensure_ascii=False)
+
+
+def _clave_bloque(desde: int, hasta: int) -> str:
+    return f"{desde}-{hasta}"
+
+
+def agregar_bloque_paginas(cola: ColaTrabajos, desde: int, hasta_maxima: Optional[int]) -> bool:
+    """Agrega el lease del bloque de páginas que empieza en `desde`.
+
+    Returns:
+        bool: False si `desde` ya supera la última página a leer.
+    """
+    if hasta_maxima is not None and desde > hasta_maxima:
+        return False
+    hasta = desde + settings.paginas_por_lease - 1
+    if hasta_maxima is not None:
+        hasta = min(hasta, hasta_maxima)
+    cola.agregar(PAGINAS, _clave_bloque(desde, hasta), {"desde": desde, "hasta": hasta})
+    return True
+
+
+def coordinar(
+    ruta_cola: str,
+    desde_pagina: int,
+    hasta_pagina: Optional[int],
+    archivo_salida: str,
+    base_url: Optional[str] = None,
+) -> int:
+    """Reparte el crawl en leases, espera a que los trabajadores terminen y exporta.
+
+    Si la cola ya existe (p. ej. al relanzar el coordinador) se reutiliza su estado.
+    Con `hasta_pagina` None los bloques de páginas se agregan a medida que los trabajadores
+    confirman que el catálogo continúa. `base_url` (por defecto `settings.base_url`) queda
+    guardada en la cola para que todos los trabajadores recorran el mismo sitio.
+
+    Returns:
+        int: Cantidad de series exportadas.
+    """
+    cola = ColaTrabajos(ruta_cola)
+    try:
+        cola.guardar_metadato("hasta_pagina", "" if hasta_pagina is None else str(hasta_pagina))
+        cola.guardar_metadato("base_url", base_url or settings.base_url)
+        if hasta_pagina is None:
+            agregar_bloque_paginas(cola, desde_pagina, None)
+        else:
+            for desde in range(desde_pagina, hasta_pagina + 1, settings.paginas_por_lease):
+                agregar_bloque_paginas(cola, desde, hasta_pagina)
+
+        while not cola.terminado():
+            logging.info(f"Estado de los leases: {cola.contar()}")
+            time.sleep(settings.intervalo_latido)
+
+        logging.info(f"Crawl terminado: {cola.contar()}. Exportando a {archivo_salida}.")
+        with ExportadorStreaming(crear_sumidero(archivo_salida)) as exportador:
+            for serie in cola.resultados():
+                exportador.agregar(serie)
+        return exportador.series_exportadas
+    finally:
+        cola.cerrar()
+
+
+def _procesar_paginas(cola: ColaTrabajos, lease: Lease) -> None:
+    """Lee un bloque de páginas de listado y agrega un lease por cada serie encontrada.
+
+    Si una página falla tras sus reintentos se lanza la excepción, de modo que el lease se
+    libera y el bloque vuelve a intentarse en lugar de darse por completo con páginas sin leer.
+    """
+    desde, hasta = lease.datos["desde"], lease.datos["hasta"]
+    ultima_leida = desde - 1
+
+    def registrar(numero_pagina: int, series: list[DatosSerie]):
+        nonlocal ultima_leida
+        ultima_leida = max(ultima_leida, numero_pagina)
+        for serie in series:
+            cola.agregar(SERIE, serie.link, dataclasses.asdict(serie))
+
+    scraping_obtener_links_series(
+        desde_pagina=desde,
+        hasta_pagina=hasta,
+        al_encontrar=registrar,
+        acumular=False,
+        propagar_errores=True,
+        base_url=cola.leer_metadato("base_url"),
+    )
+
+    if cola.leer_metadato("hasta_pagina") == "" and ultima_leida == hasta:
+        # Catálogo sin final conocido: si el bloque se leyó completo se agrega el siguiente
+        agregar_bloque_paginas(cola, hasta + 1, None)
+
+
+def trabajar(ruta_cola: str, trabajador: str, hilos: int) -> int:
+    """Reclama y procesa leases hasta que no queda trabajo en la cola.
+
+    Un hilo de latidos renueva los leases asignados al trabajador cada
+    `settings.intervalo_latido` segundos mientras siguen en proceso.
+
+    Args:
+        ruta_cola (str): Archivo SQLite de la cola.
+        trabajador (str): Identificador único del trabajador.
+        hilos (int): Leases que se procesan a la vez.
+
+    Returns:
+        int: Cantidad de leases completados por este trabajador.
+    """
+    cola = ColaTrabajos(ruta_cola)
+    detener = threading.Event()
+    completados = 0
+    lock_completados = threading.Lock()
+
+    def latidos():
+        while not detener.wait(settings.intervalo_latido):
+            cola.renovar(trabajador, settings.duracion_lease)
+
+    def procesar():
+        nonlocal completados
+        while not detener.is_set():
+            lease = cola.reclamar(trabajador, settings.duracion_lease)
+            if lease is None:
+                if cola.terminado():
+                    return
+                # Otros trabajadores tienen leases en curso que pueden generar más trabajo
+                time.sleep(settings.intervalo_latido / 2)
+                continue
+
+            try:
+                if lease.tipo == PAGINAS:
+                    _procesar_paginas(cola, lease)
+                    cola.completar(lease, trabajador)
+                else:
+                    serie = DatosSerie(**lease.datos)
+                    extraer_datos_de_serie(serie)
+                    if serie.fecha_extraccion is None:
+                        cola.liberar(lease, trabajador, settings.max_intentos_lease, serie)
+                        continue
+                    cola.completar(lease, trabajador, serie)
+            except Exception as e:
+                logging.error(f"Error al procesar el lease {lease.clave}: {e}")
+                cola.liberar(lease, trabajador, settings.max_intentos_lease)
+                continue
+            with lock_completados:
+                completados += 1
+
+    hilo_latidos = threading.Thread(target=latidos, name="latidos", daemon=True)
+    hilo_latidos.start()
+    procesadores = [
+        threading.Thread(target=procesar, name=f"trabajador-{i}") for i in range(max(1, hilos))
+    ]
+    try:
+        for hilo in procesadores:
+            hilo.start()
+        for hilo in procesadores:
+            hilo.join()
+    finally:
+        detener.set()
+        hilo_latidos.join()
+        cola.cerrar()
+    return completados
+
+
+def main():
+    """Punto de entrada de línea de comandos para el coordinador y los trabajadores."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcomandos = parser.add_subparsers(dest="rol", required=True)
+
+    coordinador = subcomandos.add_parser(
+        "coordinar", help="Reparte el crawl y exporta el resultado"
+    )
+    coordinador.add_argument("--cola", required=True, help="Archivo SQLite de la cola compartida")
+    coordinador.add_argument("--desde", type=int, default=1, help="Primera página de listado")
+    coordinador.add_argument("--hasta", type=int, default=None, help="Última página de listado")
+    coordinador.add_argument(
+        "--salida",
+        default=None,
+        help="Archivo de salida (.parquet, .pkl, .jsonl o .sqlite3)",
+    )
+    coordinador.add_argument(
+        "--base-url",
+        default=settings.base_url,
+        help="Sitio a recorrer, p. ej. un servidor local de pruebas",
+    )
+
+    trabajador = subcomandos.add_parser("trabajar", help="Procesa leases de la cola")
+    trabajador.add_argument("--cola", required=True, help="Archivo SQLite de la cola compartida")
+    trabajador.add_argument(
+        "--id", default=f"{socket.gethostname()}-{os.getpid()}", help="Nombre del trabajador"
+    )
+    trabajador.add_argument(
+        "--hilos", type=int, default=settings.max_workers_detalle, help="Leases simultáneos"
+    )
+
+    argumentos = parser.parse_args()
+    if argumentos.rol == "coordinar":
+        salida = argumentos.salida or settings.nombre_base_datos + (
+            settings.extension_salida or EXTENSION_DATOS
+        )
+        total = coordinar(
+            argumentos.cola, argumentos.desde, argumentos.hasta, salida, argumentos.base_url
+        )
+        logging.info(f"Datos guardados en {salida}. Total de series: {total}")
+    else:
+        iniciar_telemetria()
+        try:
+            completados = trabajar(argumentos.cola, argumentos.id, argumentos.hilos)
+        finally:
+            cerrar_sesion()
+            cerrar_pool_parseo()
+            cerrar_cache()
+            detener_telemetria()
+        logging.info(f"Trabajador {argumentos.id} terminado: {completados} leases completados.")
+
+
+if __name__ == "__main__":
+    main()
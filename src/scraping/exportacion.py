@@ -0,0 +1,202 @@
+"""Exportación en streaming de las series a medida que se extraen sus datos."""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Optional, Union
+
+import pandas as pd
+from almacenamiento import EscritorPorLotes
+from const import settings
+from data_frame import LoteSeries, limpiar_dataframe
+from datos_serie import DatosSerie, SerieColumn
+from telemetria import obtener_metricas
+
+EXTENSION_JSONL = ".jsonl"
+EXTENSIONES_SQLITE = (".sqlite3", ".sqlite", ".db")
+
+
+class SumideroJSONL:
+    """Escribe cada lote como líneas JSON, una por serie.
+
+    Cada lote se vuelca al disco apenas llega, así que el archivo puede leerse (p. ej. con
+    `pd.read_json(archivo, lines=True)`) mientras el crawl sigue en curso.
+    """
+
+    def __init__(self, archivo: str):
+        """Crea (o vacía) el archivo de salida."""
+        self.archivo = archivo
+        self._archivo = open(archivo, "w", encoding="utf-8")
+
+    def escribir(self, df: pd.DataFrame):
+        """Agrega las filas del lote al archivo."""
+        df.to_json(self._archivo, orient="records", lines=True, force_ascii=False)
+        self._archivo.flush()
+
+    def cerrar(self):
+        """Cierra el archivo."""
+        self._archivo.close()
+
+    def abortar(self):
+        """Cierra el archivo dejando las series ya escritas."""
+        self._archivo.close()
+
+
+class SumideroSQLite:
+    """Guarda cada lote en una tabla SQLite, reemplazando las series por su link.
+
+    Cada lote se confirma en una transacción, así que la tabla puede consultarse mientras el
+    crawl sigue en curso.
+    """
+
+    def __init__(self, archivo: str, tabla: str = "series"):
+        """Abre (o crea) la base de datos y la tabla de series."""
+        self.archivo = archivo
+        self.tabla = tabla
+        self._columnas = [columna.value for columna in SerieColumn]
+        self._conexion = sqlite3.connect(archivo, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        definicion = ", ".join(
+            f"{columna} PRIMARY KEY" if columna == SerieColumn.LINK.value else columna
+            for columna in self._columnas
+        )
+        self._conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({definicion})")
+        self._conexion.commit()
+
+    def escribir(self, df: pd.DataFrame):
+        """Inserta (o reemplaza) las filas del lote."""
+        filas = df[self._columnas].astype(object).where(df[self._columnas].notna(), None)
+        marcadores = ", ".join("?" * len(self._columnas))
+        with self._conexion:
+            self._conexion.executemany(
+                f"INSERT OR REPLACE INTO {self.tabla} VALUES ({marcadores})",
+                filas.itertuples(index=False, name=None),
+            )
+
+    def cerrar(self):
+        """Cierra la conexión."""
+        self._conexion.close()
+
+    def abortar(self):
+        """Cierra la conexión dejando las series ya confirmadas."""
+        self._conexion.close()
+
+
+Sumidero = Union[SumideroJSONL, SumideroSQLite, EscritorPorLotes]
+
+
+def crear_sumidero(archivo: str) -> Sumidero:
+    """Crea el sumidero adecuado según la extensión del archivo.
+
+    `.jsonl` escribe líneas JSON, `.sqlite3`/`.sqlite`/`.db` una tabla SQLite, y `.parquet` o
+    `.pkl` usan `EscritorPorLotes` (en Parquet, un row group por lote; el archivo aparece al
+    cerrar).
+    """
+    extension = os.path.splitext(archivo)[1]
+    if extension == EXTENSION_JSONL:
+        return SumideroJSONL(archivo)
+    if extension in EXTENSIONES_SQLITE:
+        return SumideroSQLite(archivo)
+    return EscritorPorLotes(archivo)
+
+
+class ExportadorStreaming:
+    """Etapa de escritura que vuelca las series completadas a un sumidero por lotes.
+
+    Los hilos del crawl entregan cada serie con `agregar`; un hilo escritor las agrupa en
+    lotes de `tamano_lote`, aplica `limpiar_dataframe` a cada lote y lo escribe. Como la cola
+    y el lote están acotados, la memoria no depende del tamaño del catálogo.
+
+    Uso:
+        with ExportadorStreaming(crear_sumidero("series_tv.jsonl")) as exportador:
+            exportador.agregar(serie)
+    """
+
+    def __init__(
+        self,
+        sumidero: Sumidero,
+        tamano_lote: Optional[int] = None,
+        profundidad_cola: Optional[int] = None,
+    ):
+        """Inicia el hilo escritor.
+
+        Args:
+            sumidero (Sumidero): Destino de los lotes (ver `crear_sumidero`).
+            tamano_lote (Optional[int]): Series por lote. Por defecto
+                `settings.tamano_lote_exportacion`.
+            profundidad_cola (Optional[int]): Series en espera de ser escritas antes de que
+                `agregar` se bloquee. Por defecto el doble del tamaño del lote.
+        """
+        self.sumidero = sumidero
+        self.tamano_lote = max(1, tamano_lote or settings.tamano_lote_exportacion)
+        self.series_recibidas = 0
+        self.series_exportadas = 0
+        self._cola: queue.Queue[Optional[DatosSerie]] = queue.Queue(
+            maxsize=profundidad_cola or 2 * self.tamano_lote
+        )
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        obtener_metricas().registrar_medidor("cola_exportacion", self._cola.qsize)
+        self._hilo = threading.Thread(target=self._escribir, name="exportador", daemon=True)
+        self._hilo.start()
+
+    def agregar(self, serie: DatosSerie):
+        """Entrega una serie para ser exportada. Se bloquea si el escritor va atrasado."""
+        with self._lock:
+            self.series_recibidas += 1
+        self._cola.put(serie)
+
+    def _escribir(self):
+        lote = LoteSeries()
+        while (serie := self._cola.get()) is not None:
+            lote.agregar(serie)
+            if len(lote) >= self.tamano_lote:
+                self._volcar(lote)
+                lote = LoteSeries()
+        self._volcar(lote)
+
+    def _volcar(self, lote: LoteSeries):
+        if not len(lote) or self._error is not None:
+            return
+        try:
+            self.sumidero.escribir(limpiar_dataframe(lote.a_dataframe()))
+            self.series_exportadas += len(lote)
+            obtener_metricas().incrementar("series_exportadas_total", len(lote))
+        except Exception as e:
+            # Se sigue vaciando la cola para no bloquear al crawl; el error se informa al cerrar
+            logging.error(f"Error al exportar un lote de {len(lote)} series: {e}")
+            self._error = e
+
+    def _terminar(self):
+        self._cola.put(None)
+        self._hilo.join()
+
+    def cerrar(self):
+        """Escribe el último lote y cierra el sumidero.
+
+        Raises:
+            Exception: El primer error ocurrido al escribir, si lo hubo.
+        """
+        self._terminar()
+        if self._error is not None:
+            self.sumidero.abortar()
+            raise self._error
+        self.sumidero.cerrar()
+
+    def abortar(self):
+        """Detiene la exportación y descarta lo que el sumidero no haya hecho definitivo."""
+        self._terminar()
+        self.sumidero.abortar()
+
+    def __enter__(self):
+        """Permite usar el exportador con `with`."""
+        return self
+
+    def __exit__(self, tipo_excepcion, *exc):
+        """Cierra el exportador, o lo aborta si hubo una excepción."""
+        if tipo_excepcion is None:
+            self.cerrar()
+        else:
+            self.abortar()
@@ -1,21 +1,45 @@
 """Funciones para extraer información detallada de series desde Sensacine."""
 
 import logging
-
-from bs4 import BeautifulSoup
-from datos_serie import DatosSerie
-from request import get_soup
-
-
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from const import settings
+from datos_serie import DatosSerie, internar_valores
+from parser_html import parsear_html
+from perfilado import perfilado_activo, perfilar, recolectar_tiempos, registrar_tiempos
+from pool_parseo import obtener_pool_parseo
+from request import obtener_contenido
+from telemetria import obtener_metricas, telemetria_activa
+
+# Únicos bloques de la página de una serie que usan los extractores. Al parsear con este
+# filtro no se construye el resto del documento (cabecera, noticias, scripts, pie).
+ESTRUCTURA_DETALLE = SoupStrainer(
+    "div",
+    class_=[
+        "meta-body",
+        "stats-numbers-seriespage",
+        "rating-item-content",
+        "provider-tile-primary",
+    ],
+)
+
+
+@perfilar
 def extraer_generos(info) -> list[str]:
     """Extrae los géneros de una serie desde el bloque de información.
 
     Args:
-        info (BeautifulSoup): Bloque HTML con información de la serie.
+        info (BeautifulSoup | None): Bloque HTML con información de la serie, o None si la
+            página no lo tiene.
 
     Returns:
         list[str]: Lista de géneros encontrados.
     """
+    if info is None:
+        return []
     div = info.find("div", class_="meta-body-info")
     if not div:
         return []
@@ -24,15 +48,19 @@ def extraer_generos(info) -> list[str]:
     return [g.get_text(strip=True) for g in generos_sin_procesar]
 
 
+@perfilar
 def extraer_titulo_original(info) -> str | None:
     """Extrae el título original de la serie si está disponible.
 
     Args:
-        info (BeautifulSoup): Bloque HTML con información de la serie.
+        info (BeautifulSoup | None): Bloque HTML con información de la serie, o None si la
+            página no lo tiene.
 
     Returns:
         str | None: Título original o None si no existe.
     """
+    if info is None:
+        return None
     div = info.find("div", class_="meta-body-original-title")
     if not div:
         return None
@@ -40,6 +68,7 @@ def extraer_titulo_original(info) -> str | None:
     return div.find("strong").get_text(strip=True)
 
 
+@perfilar
 def extraer_cantidad_temporadas_y_episodios(soup: BeautifulSoup) -> tuple[int | None, int | None]:
     """
     Extrae la cantidad de temporadas y episodios de la serie.
@@ -70,16 +99,20 @@ def extraer_cantidad_temporadas_y_episodios(soup: BeautifulSoup) -> tuple[int |
     return (temporadas, episodios)
 
 
+@perfilar
 def extraer_fecha_emision(info) -> tuple[int | None, int | None]:
     """
     Extrae las fechas de emisión original y última de la serie.
 
     Args:
-        info (BeautifulSoup): Bloque HTML con información de la serie.
+        info (BeautifulSoup | None): Bloque HTML con información de la serie, o None si la
+            página no lo tiene.
 
     Returns:
         tuple[int | None, int | None]: Una tupla (año_inicio, año_final), cada uno puede ser None si no se encuentra.
     """
+    if info is None:
+        return (None, None)
     div = info.find("div", class_="meta-body-info")
     if not div:
         return (None, None)
@@ -104,6 +137,7 @@ def extraer_fecha_emision(info) -> tuple[int | None, int | None]:
     return (None, None)
 
 
+@perfilar
 def extraer_puntuacion(soup: BeautifulSoup) -> float | None:
     """Extrae el puntaje de usuarios desde el objeto BeautifulSoup proporcionado."""
     divs = soup.find_all("div", class_="rating-item-content")
@@ -130,6 +164,7 @@ def extraer_puntuacion(soup: BeautifulSoup) -> float | None:
     return None
 
 
+@perfilar
 def extraer_donde_ver(soup: BeautifulSoup) -> list[str]:
     """Extrae las plataformas donde se puede ver la serie.
 
@@ -146,49 +181,158 @@ def extraer_donde_ver(soup: BeautifulSoup) -> list[str]:
     return [d.get_text(strip=True) for d in div]
 
 
+# Etapa de telemetría (`extraccion_segundos{etapa=...}`) de cada función medida al extraer
+ETAPAS_EXTRACCION = {
+    parsear_html.nombre_perfilado: "parseo",
+    extraer_generos.nombre_perfilado: "generos",
+    extraer_titulo_original.nombre_perfilado: "titulo_original",
+    extraer_cantidad_temporadas_y_episodios.nombre_perfilado: "temporadas_y_episodios",
+    extraer_fecha_emision.nombre_perfilado: "fecha_emision",
+    extraer_puntuacion.nombre_perfilado: "puntuacion",
+    extraer_donde_ver.nombre_perfilado: "donde_ver",
+}
+
+
+@perfilar
 def extraer_datos_de_serie(serie: DatosSerie):
     """Extrae y asigna todos los datos relevantes de una serie.
 
+    La página se descarga en el hilo actual. Si hay pool de parseo (ver `pool_parseo`), el
+    parseo y la extracción se hacen en otro proceso, que devuelve solo los campos extraídos.
+
     Args:
         serie (DatosSerie): Objeto DatosSerie a completar.
     """
+    metricas = obtener_metricas()
+    medir = telemetria_activa() or perfilado_activo()
     try:
-        soup = get_soup(link=serie.link)
+        contenido = obtener_contenido(serie.link)
+        pool = obtener_pool_parseo()
+        if pool is None:
+            campos, tiempos = extraer_campos_desde_contenido(contenido, medir)
+        else:
+            campos, tiempos = pool.submit(extraer_campos_desde_contenido, contenido, medir).result()
     except Exception as e:
+        metricas.incrementar("series_total", resultado="fallida")
         logging.error(f"Error al extraer datos de la serie {serie.link}: {e}")
         return
 
+    # Los tiempos de `@perfilar` alimentan tanto el perfil como la telemetría
+    registrar_tiempos(tiempos)
+    for nombre, segundos in tiempos:
+        if (etapa := ETAPAS_EXTRACCION.get(nombre)) is not None:
+            metricas.observar("extraccion_segundos", segundos, etapa=etapa)
+    metricas.incrementar("series_total", resultado="completa")
+    aplicar_campos(serie, campos)
+    serie.fecha_extraccion = time.time()
+
+
+@perfilar
+def extraer_campos_desde_contenido(
+    contenido: bytes, medir: bool = False
+) -> tuple[dict[str, Any], list[tuple[str, float]]]:
+    """Parsea la página de una serie y devuelve los campos que se pudieron extraer.
+
+    Se ejecuta en los procesos de parseo: el resultado es un diccionario pequeño de valores
+    simples, mucho más barato de serializar que el árbol de BeautifulSoup. Los tiempos del
+    parseo y de cada extractor se devuelven junto a los campos porque el perfil y las
+    métricas de otro proceso no llegarían al crawl.
+
+    Args:
+        contenido (bytes): HTML de la página de la serie.
+        medir (bool): Si es True se recolectan los tiempos de las funciones `@perfilar`.
+
+    Returns:
+        tuple: Valores por nombre de campo de DatosSerie y `(función, segundos)` de cada
+            llamada medida (vacío si `medir` es False).
+    """
+    with recolectar_tiempos(medir) as tiempos:
+        soup = parsear_html(contenido, parse_only=ESTRUCTURA_DETALLE)
+        campos = extraer_campos_desde_soup(soup)
+    return campos, tiempos
+
+
+def aplicar_campos(serie: DatosSerie, campos: dict[str, Any]):
+    """Asigna a la serie los campos extraídos, internando géneros y plataformas."""
+    for campo, valor in campos.items():
+        setattr(serie, campo, valor)
+    serie.generos = internar_valores(serie.generos)
+    serie.donde_ver = internar_valores(serie.donde_ver)
+
+
+def extraer_campos_desde_soup(soup: BeautifulSoup) -> dict[str, Any]:
+    """Extrae todos los datos que se pueden obtener de la página ya parseada de una serie.
+
+    Los campos que no aparecen en la página (temporadas, episodios, fechas) se omiten, para
+    no pisar valores que la serie ya tuviera.
+
+    Args:
+        soup (BeautifulSoup): HTML parseado de la página de la serie.
+
+    Returns:
+        dict[str, Any]: Valores por nombre de campo de DatosSerie.
+    """
+    campos: dict[str, Any] = {}
+
     # Extraer Genero y Sub-Genero
     info_serie = soup.find("div", class_="meta-body")
 
-    serie.generos = extraer_generos(info=info_serie)
+    campos["generos"] = extraer_generos(info=info_serie)
 
     # Extraer el Titulo Original
-    serie.titulo_original = extraer_titulo_original(info=info_serie)
+    campos["titulo_original"] = extraer_titulo_original(info=info_serie)
 
     # Extraer cantidad de Temporadas y cantidad de Capitulos Totales
     if temporadas_y_episodios := extraer_cantidad_temporadas_y_episodios(soup=soup):
-        serie.cantidad_temporadas = temporadas_y_episodios[0]
-        serie.cantidad_episodios_totales = temporadas_y_episodios[1]
+        campos["cantidad_temporadas"] = temporadas_y_episodios[0]
+        campos["cantidad_episodios_totales"] = temporadas_y_episodios[1]
 
     # Extraer fechas de emision original y ultima
     if fechas_emision := extraer_fecha_emision(info=info_serie):
-        serie.fecha_emision_original = fechas_emision[0]
-        serie.fecha_emision_ultima = fechas_emision[1]
+        campos["fecha_emision_original"] = fechas_emision[0]
+        campos["fecha_emision_ultima"] = fechas_emision[1]
 
     # Extraer puntuacion
-    serie.puntuacion = extraer_puntuacion(soup)
+    campos["puntuacion"] = extraer_puntuacion(soup=soup)
 
     # Extraer donde se puede ver
-    serie.donde_ver = extraer_donde_ver(soup=soup)
+    campos["donde_ver"] = extraer_donde_ver(soup=soup)
 
+    return campos
 
-def extraer_datos_de_series(series: list[DatosSerie]):
-    """Itera sobre una lista de series y extrae sus datos.
+
+def completar_datos_desde_soup(serie: DatosSerie, soup: BeautifulSoup):
+    """Asigna a la serie todos los datos que se pueden extraer de su página ya parseada.
+
+    Args:
+        serie (DatosSerie): Objeto DatosSerie a completar.
+        soup (BeautifulSoup): HTML parseado de la página de la serie.
+    """
+    aplicar_campos(serie, extraer_campos_desde_soup(soup))
+
+
+def extraer_datos_de_series(series: list[DatosSerie], max_workers: Optional[int] = None):
+    """Extrae los datos de una lista de series, descargando sus páginas de forma concurrente.
+
+    Cada serie se completa en el mismo objeto DatosSerie recibido. Las conexiones
+    simultáneas a un mismo host quedan limitadas por `settings.max_conexiones_por_host`.
 
     Args:
         series (list[DatosSerie]): Lista de series a procesar.
+        max_workers (Optional[int]): Cantidad de hilos de descarga. Si es None se usa
+            `settings.max_workers_detalle`; con 1 o menos se procesa secuencialmente.
     """
-    for serie in series:
-        extraer_datos_de_serie(serie=serie)
-        logging.info(serie)
+    if max_workers is None:
+        max_workers = settings.max_workers_detalle
+
+    if max_workers <= 1:
+        for serie in series:
+            extraer_datos_de_serie(serie=serie)
+            logging.debug(f"Serie procesada: {serie.link}")
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {executor.submit(extraer_datos_de_serie, serie=serie): serie for serie in series}
+        for futuro in as_completed(futuros):
+            futuro.result()
+            logging.debug(f"Serie procesada: {futuros[futuro].link}")
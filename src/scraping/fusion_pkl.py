@@ -1,42 +1,92 @@
-"""Módulo para fusionar archivos pickle de series de TV en el proyecto de Web Scraping."""
+"""Módulo para fusionar los archivos de series de TV (Parquet o pickle) en el proyecto de Web Scraping."""
 
 import glob
 import os
-import pickle
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
+from almacenamiento import (
+    EXTENSION_DATOS,
+    EXTENSION_PARQUET,
+    EXTENSION_PICKLE,
+    EscritorPorLotes,
+    cargar_dataframe,
+)
 from const import settings
+from data_frame import limpiar_dataframe
+from datos_serie import SerieColumn
+
+
+def leer_archivos_en_paralelo(archivos: list[str], hilos: int) -> Iterator[pd.DataFrame]:
+    """Carga los archivos con varios hilos y los entrega en orden.
+
+    Como máximo hay `hilos` archivos cargados a la espera de ser consumidos, por lo que la
+    memoria no crece con la cantidad de archivos.
+    """
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        pendientes: deque[Future[pd.DataFrame]] = deque()
+        restantes = iter(archivos)
+        for archivo in restantes:
+            pendientes.append(executor.submit(cargar_dataframe, archivo))
+            if len(pendientes) >= hilos:
+                break
+        while pendientes:
+            df = pendientes.popleft().result()
+            siguiente = next(restantes, None)
+            if siguiente is not None:
+                pendientes.append(executor.submit(cargar_dataframe, siguiente))
+            yield df
+
+
+def fusionar_archivos(archivos: list[str], archivo_salida: str) -> int:
+    """
+    Fusiona los archivos en `archivo_salida` procesándolos de a uno y sin filas repetidas.
+
+    Cada archivo se limpia, se le quitan las series cuyo link ya apareció (en ese u otro
+    archivo) y se escribe de inmediato. Los links vistos se guardan como hashes de 64 bits
+    en un arreglo ordenado de numpy. El archivo de salida se reemplaza de forma atómica.
+
+    Returns:
+        int: Cantidad de series escritas.
+    """
+    vistos = np.empty(0, dtype=np.uint64)
+
+    with EscritorPorLotes(archivo_salida) as escritor:
+        for df in leer_archivos_en_paralelo(archivos, settings.hilos_fusion):
+            df = limpiar_dataframe(df)
+            hashes = pd.util.hash_pandas_object(df[SerieColumn.LINK.value], index=False).to_numpy()
+            nuevas = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, vistos)
+            vistos = np.union1d(vistos, hashes[nuevas])
+            escritor.escribir(df[nuevas])
+
+    return escritor.filas
 
 
 def main():
     """
-    Fusiona todos los archivos pickle de series de TV en un solo DataFrame y lo guarda en un archivo.
+    Fusiona todos los archivos de series de TV en un solo archivo.
 
-    Busca archivos que coincidan con el patrón 'series_tv_*_*.pkl', los carga, concatena y guarda el resultado.
+    Busca archivos que coincidan con el patrón 'series_tv_*_*.parquet' o 'series_tv_*_*.pkl' y los fusiona con `fusionar_archivos`.
     """
-    # Buscar todos los archivos que coincidan con el patrón 'series_tv_*.pkl' en el directorio principal
+    # Buscar todos los archivos que coincidan con el patrón 'series_tv_*_*' en el directorio principal
     directorio_principal = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    patron = os.path.join(directorio_principal, "series_tv_*_*.pkl")
-    archivos = [f for f in glob.glob(patron) if os.path.basename(f) != settings.nombre_archivo_pkl]
+    archivos = []
+    for extension in (EXTENSION_PARQUET, EXTENSION_PICKLE):
+        patron = os.path.join(directorio_principal, f"{settings.nombre_base_datos}_*_*{extension}")
+        archivos += sorted(glob.glob(patron))
 
     if not archivos:
         print("No se encontraron archivos para fusionar.")
         exit(1)
 
-    dfs = []
-    for archivo in archivos:
-        with open(archivo, "rb") as f:
-            df = pickle.load(f)
-            dfs.append(df)
-
-    # Concatenar todos los DataFrames
-    df_final = pd.concat(dfs, ignore_index=True)
-
-    # Guardar el DataFrame fusionado
-    archivo_salida = os.path.join(directorio_principal, settings.nombre_archivo_pkl)
-    with open(archivo_salida, "wb") as f:
-        pickle.dump(df_final, f)
-    print(f"Datos fusionados guardados en {archivo_salida}. Total de series: {len(df_final)}")
+    archivo_salida = os.path.join(
+        directorio_principal, settings.nombre_base_datos + EXTENSION_DATOS
+    )
+    total = fusionar_archivos(archivos, archivo_salida)
+    print(f"Datos fusionados guardados en {archivo_salida}. Total de series: {total}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""Re-scraping incremental: solo se extraen las series nuevas o con datos antiguos."""
+
+import logging
+import os
+import time
+from typing import Optional
+
+import pandas as pd
+from almacenamiento import buscar_archivo_datos, cargar_dataframe, guardar_dataframe
+from cache_http import cerrar_cache
+from const import settings
+from data_frame import datos_series_a_dataframe, limpiar_dataframe
+from datos_serie import DatosSerie, SerieColumn
+from extraer_datos import extraer_datos_de_series
+from listado import scraping_obtener_links_series
+from pool_parseo import cerrar_pool_parseo
+from sesion import cerrar_sesion
+from telemetria import detener_telemetria, iniciar_telemetria
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def seleccionar_series_a_actualizar(
+    descubiertas: list[DatosSerie], df_anterior: pd.DataFrame, antiguedad_maxima: float
+) -> list[DatosSerie]:
+    """Devuelve las series descubiertas que son nuevas o cuya extracción es demasiado antigua.
+
+    Args:
+        descubiertas (list[DatosSerie]): Series encontradas en las páginas de listado.
+        df_anterior (pd.DataFrame): Dataset de la ejecución anterior.
+        antiguedad_maxima (float): Segundos tras los que una serie se considera desactualizada.
+
+    Returns:
+        list[DatosSerie]: Series a las que se les debe volver a extraer los datos.
+    """
+    fechas_anteriores: dict[str, float] = {}
+    if not df_anterior.empty:
+        fechas_anteriores = dict(
+            zip(
+                df_anterior[SerieColumn.LINK.value],
+                df_anterior[SerieColumn.FECHA_EXTRACCION.value],
+            )
+        )
+
+    limite = time.time() - antiguedad_maxima
+    return [s for s in descubiertas if fechas_anteriores.get(s.link, 0.0) < limite]
+
+
+def fusionar_por_link(df_anterior: pd.DataFrame, df_nuevo: pd.DataFrame) -> pd.DataFrame:
+    """Reemplaza en el dataset anterior las filas actualizadas y agrega las nuevas, usando el link."""
+    if df_anterior.empty:
+        return df_nuevo.reset_index(drop=True)
+    conservadas = df_anterior[
+        ~df_anterior[SerieColumn.LINK.value].isin(df_nuevo[SerieColumn.LINK.value])
+    ]
+    return pd.concat([conservadas, df_nuevo], ignore_index=True)
+
+
+def actualizar_incremental(
+    archivo: str,
+    desde_pagina: Optional[int] = 1,
+    hasta_pagina: Optional[int] = None,
+    antiguedad_maxima: Optional[float] = None,
+) -> pd.DataFrame:
+    """Actualiza un dataset guardado extrayendo solo las series nuevas o desactualizadas.
+
+    Las series cuya re-extracción falla conservan los datos de la ejecución anterior.
+
+    Args:
+        archivo (str): Archivo (Parquet o pickle) con el dataset anterior. Si no existe se
+            parte de cero.
+        desde_pagina (Optional[int]): Primera página de listado a recorrer.
+        hasta_pagina (Optional[int]): Última página de listado a recorrer.
+        antiguedad_maxima (Optional[float]): Segundos tras los que se re-extrae una serie.
+            Por defecto `settings.dias_antiguedad_incremental` días.
+
+    Returns:
+        pd.DataFrame: Dataset actualizado y limpio.
+    """
+    if antiguedad_maxima is None:
+        antiguedad_maxima = settings.dias_antiguedad_incremental * 24 * 60 * 60
+
+    df_anterior = pd.DataFrame()
+    if os.path.exists(archivo):
+        df_anterior = limpiar_dataframe(cargar_dataframe(archivo))
+
+    descubiertas = scraping_obtener_links_series(
+        desde_pagina=desde_pagina, hasta_pagina=hasta_pagina
+    )
+    pendientes = seleccionar_series_a_actualizar(descubiertas, df_anterior, antiguedad_maxima)
+    logging.info(
+        f"Series descubiertas: {len(descubiertas)}. Nuevas o desactualizadas: {len(pendientes)}"
+    )
+
+    extraer_datos_de_series(pendientes)
+
+    links_anteriores = set(df_anterior[SerieColumn.LINK.value]) if not df_anterior.empty else set()
+    actualizadas = [
+        s for s in pendientes if s.fecha_extraccion is not None or s.link not in links_anteriores
+    ]
+    if not actualizadas:
+        return df_anterior
+
+    df_nuevo = limpiar_dataframe(datos_series_a_dataframe(actualizadas))
+    return fusionar_por_link(df_anterior, df_nuevo)
+
+
+def main():
+    """Actualiza de forma incremental el archivo consolidado de series."""
+    archivo = buscar_archivo_datos(settings.nombre_base_datos)
+    iniciar_telemetria()
+    df = actualizar_incremental(archivo, desde_pagina=1, hasta_pagina=None)
+    cerrar_sesion()
+    cerrar_pool_parseo()
+    cerrar_cache()
+    detener_telemetria()
+
+    guardar_dataframe(df, archivo)
+    logging.info(f"Datos actualizados en {archivo}. Total de series: {len(df)}")
+
+
+if __name__ == "__main__":
+    main()
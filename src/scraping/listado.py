@@ -0,0 +1,134 @@
+"""Recorrido de las páginas de listado de series de TV de Sensacine."""
+
+import dataclasses
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from const import AppSettings, settings
+from datos_serie import DatosSerie
+from planificador import calcular_espera
+from request import buscar_links_de_series, get_soup
+
+
+def huella_pagina(series_en_pagina: list[DatosSerie]) -> int:
+    """Calcula una huella barata de una página de listado a partir de su conjunto de links."""
+    return hash(frozenset(serie.link for serie in series_en_pagina))
+
+
+def _leer_pagina(
+    configuracion: AppSettings, numero_pagina: int, espera: float = 0.0
+) -> list[DatosSerie]:
+    """Descarga una página de listado, tras `espera` segundos, y devuelve sus series."""
+    time.sleep(espera)
+    logging.info(f"Se va a leer la pagina {numero_pagina}.")
+    link_pagina = configuracion.series_tv_link + "?page=" + str(numero_pagina)
+    return buscar_links_de_series(soup=get_soup(link=link_pagina), base_url=configuracion.base_url)
+
+
+def scraping_obtener_links_series(
+    desde_pagina: Optional[int] = 1,
+    hasta_pagina: Optional[int] = None,
+    al_encontrar: Optional[Callable[[int, list[DatosSerie]], None]] = None,
+    acumular: bool = True,
+    propagar_errores: bool = False,
+    base_url: Optional[str] = None,
+) -> list[DatosSerie]:
+    """Obtiene los links de las series de TV desde Sensacine entre las páginas indicadas.
+
+    Las páginas se piden de forma especulativa en ventanas de `settings.ventana_paginas_listado`
+    peticiones simultáneas, pero se procesan en orden. Una página que falla se vuelve a pedir
+    hasta `settings.reintentos_pagina_listado` veces antes de dar el listado por terminado. El final del catálogo se detecta cuando
+    una página viene vacía o tiene la misma huella que la anterior; en ese momento se cancelan
+    las páginas especulativas pendientes.
+
+    Args:
+        desde_pagina (Optional[int]): Primera página a leer. Si es None se parte en la 1.
+        hasta_pagina (Optional[int]): Última página a leer. Si es None se lee hasta el final.
+        al_encontrar (Optional[Callable[[int, list[DatosSerie]], None]]): Función que recibe el
+            número de cada página y sus series apenas se descubren.
+        acumular (bool): Si es False las series solo se entregan a `al_encontrar` y no se
+            retienen, de modo que la memoria no crece con el catálogo.
+        propagar_errores (bool): Si es True, una página que sigue fallando tras los reintentos
+            lanza su excepción en lugar de dar el listado por terminado, para que quien llama
+            pueda distinguir un error del final del catálogo.
+        base_url (Optional[str]): Sitio a recorrer. Por defecto `settings.base_url`.
+
+    Returns:
+        list[DatosSerie]: Todas las series encontradas, en orden de aparición (vacía si
+            `acumular` es False).
+    """
+    configuracion = (
+        settings if base_url is None else dataclasses.replace(settings, base_url=base_url)
+    )
+    series: list[DatosSerie] = []
+    contador_paginas = 1 if desde_pagina is None else desde_pagina
+    ventana = max(1, settings.ventana_paginas_listado)
+    huella_anterior: Optional[int] = None
+    intentos_fallidos: dict[int, int] = {}
+
+    executor = ThreadPoolExecutor(max_workers=ventana, thread_name_prefix="listado")
+    futuros: dict[int, Future[list[DatosSerie]]] = {}
+    siguiente_a_pedir = contador_paginas
+
+    def pedir_hasta_llenar_ventana():
+        nonlocal siguiente_a_pedir
+        while len(futuros) < ventana and (
+            hasta_pagina is None or siguiente_a_pedir <= hasta_pagina
+        ):
+            futuros[siguiente_a_pedir] = executor.submit(
+                _leer_pagina, configuracion, siguiente_a_pedir
+            )
+            siguiente_a_pedir += 1
+
+    try:
+        pedir_hasta_llenar_ventana()
+        while contador_paginas in futuros:
+            try:
+                series_en_pagina = futuros.pop(contador_paginas).result()
+            except Exception as e:
+                fallos = intentos_fallidos.get(contador_paginas, 0) + 1
+                intentos_fallidos[contador_paginas] = fallos
+                if fallos > settings.reintentos_pagina_listado:
+                    logging.error(f"Error al obtener links de la página {contador_paginas}: {e}")
+                    if propagar_errores:
+                        raise
+                    break
+                espera = calcular_espera(
+                    fallos, settings.espera_base_reintento, settings.espera_maxima_reintento
+                )
+                logging.warning(
+                    f"Se reintentará la página {contador_paginas} en {espera:.1f}s: {e}"
+                )
+                futuros[contador_paginas] = executor.submit(
+                    _leer_pagina, configuracion, contador_paginas, espera
+                )
+                continue
+
+            if not series_en_pagina:
+                logging.error(
+                    f"No hay series en la pagina actual.\tSe asume que en las siguientes tampoco habra mas."
+                )
+                break
+
+            huella = huella_pagina(series_en_pagina)
+            if huella_anterior is not None and huella_anterior == huella:
+                # Si la página actual es igual a la anterior, se detiene el bucle
+                break
+
+            if acumular:
+                series += series_en_pagina
+            huella_anterior = huella
+
+            if al_encontrar is not None:
+                al_encontrar(contador_paginas, series_en_pagina)
+
+            contador_paginas += 1
+
+            pedir_hasta_llenar_ventana()
+    finally:
+        # Se descartan las páginas especulativas que aún no han comenzado
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return series
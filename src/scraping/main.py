@@ -1,98 +1,78 @@
 """Script principal para el scraping de series de TV desde Sensacine."""
 
 import logging
+import os
 from typing import Optional
 
+from almacenamiento import EXTENSION_DATOS
+from cache_http import cerrar_cache
+from checkpoint import Checkpoint
 from const import settings
-from data_frame import (
-    datos_series_a_dataframe,
-    guardar_dataframe_pickle,
-    limpiar_dataframe,
-)
-from datos_serie import DatosSerie
-from extraer_datos import extraer_datos_de_series
-from request import buscar_links_de_series, get_soup
+from exportacion import ExportadorStreaming, crear_sumidero
+from perfilado import ejecucion_perfilada, etapa
+from pipeline import ejecutar_pipeline
+from pool_parseo import cerrar_pool_parseo
+from sesion import cerrar_sesion
+from telemetria import detener_telemetria, iniciar_telemetria
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
-def scraping_obtener_links_series(
-    desde_pagina: Optional[int] = 1, hasta_pagina: Optional[int] = None
-) -> list[DatosSerie]:
-    """Obtiene los links de las series de TV desde Sensacine entre las páginas indicadas."""
-    series: list[DatosSerie] = []
-    link_paginas_a_buscar_base = settings.series_tv_link + "?page="
-
-    if desde_pagina is None:
-        contador_paginas = 1
-    else:
-        contador_paginas = desde_pagina
-
-    series_en_pagina_anterior = None
-
-    while True:
-        if hasta_pagina is not None and contador_paginas == hasta_pagina + 1:
-            break
-
-        logging.info(f"Se va a leer la pagina {contador_paginas}.")
-        link_pagina_a_buscar_actual = link_paginas_a_buscar_base + str(contador_paginas)
-
-        try:
-            series_en_pagina = buscar_links_de_series(
-                soup=get_soup(link=link_pagina_a_buscar_actual)
-            )
-        except Exception as e:
-            logging.error(f"Error al obtener links de la página {contador_paginas}: {e}")
-            break
-
-        if not series_en_pagina:
-            logging.error(
-                f"No hay series en la pagina actual.\tSe asume que en las siguientes tampoco habra mas."
-            )
-            break
-
-        if series_en_pagina_anterior is not None and series_en_pagina_anterior == series_en_pagina:
-            # Si la página actual es igual a la anterior, se detiene el bucle
-            break
-
-        series += series_en_pagina
-        series_en_pagina_anterior = series_en_pagina
-        contador_paginas += 1
-
-    return series
-
-
+@ejecucion_perfilada("scraping", settings)
 def main():
     """Función principal del script. Orquesta el scraping y muestra resultados."""
     desde_pagina: Optional[int] = 1
     hasta_pagina: Optional[int] = 150
-    series = scraping_obtener_links_series(desde_pagina=desde_pagina, hasta_pagina=hasta_pagina)
 
-    if not series:
+    # Creacion del nombre definitivo del archivo
+    nombre_desde = 1 if desde_pagina is None else desde_pagina
+    nombre_hasta = "X" if hasta_pagina is None else hasta_pagina
+
+    extension = settings.extension_salida or EXTENSION_DATOS
+    nombre_archivo = f"{settings.nombre_base_datos}_{nombre_desde}_{nombre_hasta}{extension}"
+
+    # El checkpoint permite reanudar el crawl si el proceso se interrumpe
+    archivo_checkpoint = nombre_archivo + settings.sufijo_checkpoint
+    checkpoint = Checkpoint(archivo_checkpoint)
+
+    # Cada serie se escribe al archivo de salida apenas se extraen sus datos
+    exportador = ExportadorStreaming(crear_sumidero(nombre_archivo))
+
+    logging.info("SE EXTRAERAN LOS DATOS DE LAS SERIES A MEDIDA QUE SE DESCUBREN")
+    iniciar_telemetria()
+    try:
+        with etapa("crawl"):
+            ejecutar_pipeline(
+                desde_pagina=desde_pagina,
+                hasta_pagina=hasta_pagina,
+                checkpoint=checkpoint,
+                exportador=exportador,
+            )
+    except BaseException:
+        exportador.abortar()
+        raise
+    finally:
+        cerrar_sesion()
+        cerrar_pool_parseo()
+        cerrar_cache()
+        checkpoint.cerrar()
+        detener_telemetria()
+
+    if not exportador.series_recibidas:
+        exportador.abortar()
         print("No hay series a para extraer los datos")
         exit(1)
 
-    logging.info("SE EXTRAERAN LOS DATOS DE LAS SERIES")
-
-    extraer_datos_de_series(series)
-    df = datos_series_a_dataframe(series)
-    df = limpiar_dataframe(df)
-
-    # Creacion del nombre definitivo del archivo
-    if desde_pagina is None:
-        desde_pagina = 1
-
-    if hasta_pagina is None:
-        hasta_pagina = "X"
-
-    nombre_archivo = settings.nombre_archivo_pkl
-    partes_nombre_archivo = nombre_archivo.split(".")
-    nombre_archivo = (
-        partes_nombre_archivo[0] + f"_{desde_pagina}_{hasta_pagina}." + partes_nombre_archivo[1]
+    with etapa("cierre de la exportación"):
+        exportador.cerrar()
+    logging.info(
+        f"Datos guardados en {nombre_archivo}. Total de series: {exportador.series_exportadas}"
     )
 
-    guardar_dataframe_pickle(df, nombre_archivo)
-    logging.info(f"Datos guardados en {nombre_archivo}. Total de series: {len(df)}")
+    # El crawl terminó y sus datos ya están guardados
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(archivo_checkpoint + sufijo):
+            os.remove(archivo_checkpoint + sufijo)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""Selección del backend de parseo HTML usado por BeautifulSoup."""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from const import settings
+from perfilado import perfilar
+
+PARSER_RESPALDO = "html.parser"
+
+
+@lru_cache(maxsize=None)
+def resolver_parser(nombre: str) -> str:
+    """Devuelve el backend pedido si está instalado o, si no, el parser de la biblioteca estándar.
+
+    Args:
+        nombre (str): Nombre del tree builder de BeautifulSoup ("lxml", "html.parser", ...).
+
+    Returns:
+        str: Nombre del backend que se usará efectivamente.
+    """
+    try:
+        BeautifulSoup("", nombre)
+    except FeatureNotFound:
+        logging.warning(f"El parser '{nombre}' no está instalado, se usará '{PARSER_RESPALDO}'.")
+        return PARSER_RESPALDO
+    return nombre
+
+
+@perfilar
+def parsear_html(
+    contenido: bytes | str,
+    parser: Optional[str] = None,
+    parse_only: Optional[SoupStrainer] = None,
+) -> BeautifulSoup:
+    """Parsea el HTML con el backend configurado.
+
+    Los extractores solo usan la API de BeautifulSoup (`find`, `find_all`, `get_text`), por lo
+    que funcionan igual con cualquier backend.
+
+    Args:
+        contenido (bytes | str): HTML a parsear.
+        parser (Optional[str]): Backend a usar. Por defecto `settings.parser_html`.
+        parse_only (Optional[SoupStrainer]): Filtro de nodos; solo se construyen en el árbol
+            los subárboles que lo cumplen.
+
+    Returns:
+        BeautifulSoup: Objeto parseado del HTML.
+    """
+    return BeautifulSoup(
+        contenido, resolver_parser(parser or settings.parser_html), parse_only=parse_only
+    )
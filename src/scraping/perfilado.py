@@ -0,0 +1,334 @@
+"""Perfilado del scraping y del análisis: tiempo y memoria por etapa y pilas muestreadas.
+
+Durante una ejecución perfilada (ver `ejecucion_perfilada`):
+    - `etapa(nombre)` mide el tiempo real, el tiempo de CPU y el pico de memoria (tracemalloc)
+      de un bloque del programa principal.
+    - `@perfilar` cuenta las llamadas y el tiempo acumulado de una función costosa, desde
+      cualquier hilo (con varios hilos, el total puede superar la duración de la etapa).
+    - Un hilo muestrea periódicamente las pilas de todos los hilos y las guarda en formato
+      "collapsed" (`pila;de;frames cantidad`), que leen directamente flamegraph.pl,
+      speedscope o inferno.
+
+Fuera de una ejecución perfilada `perfilar` solo agrega dos comprobaciones por llamada y
+`etapa` devuelve un contexto vacío. Las funciones que se ejecutan en el pool de parseo
+corren en otros procesos, donde no hay perfilador: sus tiempos se recolectan allí con
+`recolectar_tiempos` y el proceso principal los registra con `registrar_tiempos`. La
+telemetría de la extracción usa esos mismos tiempos, así que cada función se mide una vez.
+
+El módulo no importa `const` para poder usarse también desde el análisis, que importa el
+scraping como paquete: los puntos de entrada le pasan su configuración.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+# Sitios de asignación de memoria que se incluyen en el resumen
+CANTIDAD_SITIOS_MEMORIA = 10
+
+
+@dataclass
+class EstadisticaEtapa:
+    """Tiempo y memoria de una etapa."""
+
+    nombre: str
+    segundos: float
+    segundos_cpu: float
+    pico_memoria: int
+
+
+@dataclass
+class EstadisticaFuncion:
+    """Llamadas y tiempo acumulado de una función perfilada."""
+
+    nombre: str
+    llamadas: int = 0
+    segundos: float = 0.0
+    maximo: float = 0.0
+
+
+class Perfilador:
+    """Registro de etapas, funciones y pilas muestreadas de una ejecución."""
+
+    def __init__(self, nombre: str, intervalo: float):
+        """Prepara el registro; el muestreo y tracemalloc empiezan con `iniciar`.
+
+        Args:
+            nombre (str): Nombre de la ejecución, usado en los archivos de salida.
+            intervalo (float): Segundos entre muestras de las pilas.
+        """
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self.etapas: list[EstadisticaEtapa] = []
+        self.funciones: dict[str, EstadisticaFuncion] = {}
+        self.pilas: Counter[str] = Counter()
+        self.muestras = 0
+        self._lock = threading.Lock()
+        # Pico de memoria de cada etapa abierta, para propagarlo a las que la contienen
+        self._picos_abiertos: list[int] = []
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._inicio = 0.0
+        self._duracion: Optional[float] = None
+
+    def iniciar(self):
+        """Empieza a registrar la memoria y a muestrear las pilas."""
+        self._inicio = time.perf_counter()
+        tracemalloc.start()
+        self._hilo = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> tracemalloc.Snapshot:
+        """Detiene el muestreo y tracemalloc; devuelve la última foto de la memoria."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+        self._duracion = time.perf_counter() - self._inicio
+        foto = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        return foto
+
+    @contextlib.contextmanager
+    def etapa(self, nombre: str):
+        """Mide el tiempo y el pico de memoria del bloque `with`.
+
+        Las etapas pueden anidarse: el pico de una etapa incluye el de las etapas internas.
+        Deben abrirse desde un solo hilo, ya que tracemalloc tiene un único pico por proceso.
+        """
+        _, pico_actual = tracemalloc.get_traced_memory()
+        if self._picos_abiertos:
+            self._picos_abiertos[-1] = max(self._picos_abiertos[-1], pico_actual)
+        tracemalloc.reset_peak()
+        self._picos_abiertos.append(0)
+        inicio = time.perf_counter()
+        inicio_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            segundos_cpu = time.process_time() - inicio_cpu
+            pico = max(self._picos_abiertos.pop(), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            if self._picos_abiertos:
+                self._picos_abiertos[-1] = max(self._picos_abiertos[-1], pico)
+            self.etapas.append(EstadisticaEtapa(nombre, segundos, segundos_cpu, pico))
+
+    def registrar_llamada(self, nombre: str, segundos: float):
+        """Suma una llamada de `segundos` a la función `nombre`."""
+        with self._lock:
+            estadistica = self.funciones.get(nombre)
+            if estadistica is None:
+                estadistica = self.funciones[nombre] = EstadisticaFuncion(nombre)
+            estadistica.llamadas += 1
+            estadistica.segundos += segundos
+            estadistica.maximo = max(estadistica.maximo, segundos)
+
+    def _muestrear(self):
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            nombres = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila = []
+                while frame is not None:
+                    codigo = frame.f_code
+                    # Las envolturas de este módulo solo agregarían ruido a las pilas
+                    if codigo.co_filename == __file__:
+                        frame = frame.f_back
+                        continue
+                    archivo = os.path.basename(codigo.co_filename)
+                    pila.append(f"{codigo.co_name} ({archivo}:{codigo.co_firstlineno})")
+                    frame = frame.f_back
+                # Los hilos de un mismo pool se agrupan bajo un único nombre
+                hilo = nombres.get(ident, "hilo").rstrip("0123456789_-") or "hilo"
+                pila.append(hilo)
+                self.pilas[";".join(reversed(pila))] += 1
+            self.muestras += 1
+
+    def resumen(self, foto: Optional[tracemalloc.Snapshot] = None) -> str:
+        """Devuelve una tabla de texto con las etapas, las funciones y la memoria."""
+        total = self._duracion if self._duracion is not None else time.perf_counter() - self._inicio
+        lineas = [f"Perfil de {self.nombre}: {total:.2f} s, {self.muestras} muestras de pilas"]
+        lineas.append("")
+        lineas.append(f"{'Etapa':<50} {'segundos':>10} {'CPU s':>10} {'pico MiB':>10}")
+        for etapa in self.etapas:
+            lineas.append(
+                f"{etapa.nombre:<50} {etapa.segundos:>10.3f} {etapa.segundos_cpu:>10.3f} "
+                f"{etapa.pico_memoria / 2**20:>10.1f}"
+            )
+        lineas.append("")
+        lineas.append(
+            f"{'Función':<50} {'llamadas':>10} {'total s':>10} {'medio ms':>10} {'máx ms':>10}"
+        )
+        for funcion in sorted(self.funciones.values(), key=lambda f: f.segundos, reverse=True):
+            lineas.append(
+                f"{funcion.nombre:<50} {funcion.llamadas:>10} {funcion.segundos:>10.3f} "
+                f"{funcion.segundos / funcion.llamadas * 1000:>10.2f} {funcion.maximo * 1000:>10.2f}"
+            )
+        if foto is not None:
+            lineas.append("")
+            lineas.append("Memoria retenida al terminar, por sitio de asignación:")
+            for estadistica in foto.statistics("lineno")[:CANTIDAD_SITIOS_MEMORIA]:
+                lineas.append(f"  {estadistica}")
+        return "\n".join(lineas)
+
+    def guardar(self, directorio: str, foto: Optional[tracemalloc.Snapshot] = None) -> str:
+        """Escribe las pilas (.collapsed), el resumen (.txt) y los datos (.json).
+
+        Returns:
+            str: Ruta base de los archivos escritos, sin extensión.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        base = os.path.join(directorio, f"{self.nombre}_{time.strftime('%Y%m%d_%H%M%S')}")
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for pila, cantidad in self.pilas.most_common():
+                f.write(f"{pila} {cantidad}\n")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.resumen(foto) + "\n")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "nombre": self.nombre,
+                    "intervalo_muestreo": self.intervalo,
+                    "muestras": self.muestras,
+                    "etapas": [asdict(etapa) for etapa in self.etapas],
+                    "funciones": [asdict(funcion) for funcion in self.funciones.values()],
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        return base
+
+
+_perfilador: Optional[Perfilador] = None
+# Tiempos recolectados por `recolectar_tiempos` en cada hilo
+_recolectados = threading.local()
+
+
+def perfilado_activo() -> bool:
+    """Indica si hay un perfilado en curso."""
+    return _perfilador is not None
+
+
+def perfilar(funcion: Callable) -> Callable:
+    """Decorador que registra las llamadas y el tiempo de `funcion` mientras se perfila.
+
+    Dentro de `recolectar_tiempos` el tiempo se anota en la lista recolectada en lugar de
+    registrarse. El nombre con que se registra queda en `envoltura.nombre_perfilado`.
+    """
+    nombre = f"{funcion.__module__.rsplit('.', 1)[-1]}.{funcion.__qualname__}"
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        perfilador = _perfilador
+        tiempos = getattr(_recolectados, "tiempos", None)
+        if perfilador is None and tiempos is None:
+            return funcion(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            segundos = time.perf_counter() - inicio
+            if tiempos is not None:
+                tiempos.append((nombre, segundos))
+            elif perfilador is not None:
+                perfilador.registrar_llamada(nombre, segundos)
+
+    envoltura.nombre_perfilado = nombre  # type: ignore[attr-defined]
+    return envoltura
+
+
+@contextlib.contextmanager
+def recolectar_tiempos(activo: bool = True):
+    """Contexto que recolecta las llamadas a funciones `@perfilar` del hilo actual.
+
+    Devuelve una lista que se llena con `(nombre, segundos)` de cada llamada hecha dentro del
+    bloque, aunque no se esté perfilando. Sirve para medir código que corre en otro proceso:
+    la lista se devuelve al proceso principal, que la registra con `registrar_tiempos`. Si
+    `activo` es False no se mide y la lista queda vacía.
+    """
+    tiempos: list[tuple[str, float]] = []
+    if not activo:
+        yield tiempos
+        return
+    anteriores = getattr(_recolectados, "tiempos", None)
+    _recolectados.tiempos = tiempos
+    try:
+        yield tiempos
+    finally:
+        _recolectados.tiempos = anteriores
+
+
+def registrar_tiempos(tiempos: list[tuple[str, float]]):
+    """Registra en el perfil en curso las llamadas recolectadas con `recolectar_tiempos`."""
+    perfilador = _perfilador
+    if perfilador is None:
+        return
+    for nombre, segundos in tiempos:
+        perfilador.registrar_llamada(nombre, segundos)
+
+
+def etapa(nombre: str):
+    """Contexto que mide una etapa del programa, o un contexto vacío si no se perfila."""
+    if _perfilador is None:
+        return contextlib.nullcontext()
+    return _perfilador.etapa(nombre)
+
+
+def iniciar_perfilado(nombre: str, intervalo: float):
+    """Empieza a perfilar la ejecución, muestreando las pilas cada `intervalo` segundos."""
+    global _perfilador
+    if _perfilador is not None:
+        return
+    _perfilador = Perfilador(nombre, intervalo)
+    _perfilador.iniciar()
+
+
+def detener_perfilado(directorio: str) -> Optional[str]:
+    """Termina el perfilado, guarda sus archivos y devuelve el resumen (None si no se perfiló)."""
+    global _perfilador
+    if _perfilador is None:
+        return None
+    perfilador, _perfilador = _perfilador, None
+    foto = perfilador.detener()
+    base = perfilador.guardar(directorio, foto)
+    return f"{perfilador.resumen(foto)}\n\nPerfil guardado en {base}.{{collapsed,txt,json}}"
+
+
+def ejecucion_perfilada(nombre: str, configuracion: Any) -> Callable[[Callable], Callable]:
+    """Decorador para los puntos de entrada: perfila la ejecución completa si está activado.
+
+    Al terminar, aunque sea por una excepción o una interrupción, guarda el perfil en
+    `configuracion.directorio_perfilado` e imprime el resumen por stderr.
+
+    Args:
+        nombre (str): Nombre de la ejecución, usado en los archivos de salida.
+        configuracion (AppSettings): Configuración con `perfilado`, `directorio_perfilado`
+            e `intervalo_muestreo_perfilado`.
+    """
+
+    def decorar(funcion: Callable) -> Callable:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not configuracion.perfilado:
+                return funcion(*args, **kwargs)
+            iniciar_perfilado(nombre, configuracion.intervalo_muestreo_perfilado)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                if (resumen := detener_perfilado(configuracion.directorio_perfilado)) is not None:
+                    print(resumen, file=sys.stderr)
+
+        return envoltura
+
+    return decorar
@@ -0,0 +1,148 @@
+"""Pipeline productor/consumidor que solapa el descubrimiento de series con su extracción."""
+
+import logging
+import queue
+import threading
+from typing import Optional
+
+from checkpoint import Checkpoint
+from const import settings
+from datos_serie import DatosSerie
+from exportacion import ExportadorStreaming
+from extraer_datos import extraer_datos_de_serie, extraer_datos_de_series
+from listado import scraping_obtener_links_series
+from telemetria import obtener_metricas
+
+
+def ejecutar_pipeline(
+    desde_pagina: Optional[int] = 1,
+    hasta_pagina: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    profundidad_cola: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    exportador: Optional[ExportadorStreaming] = None,
+    base_url: Optional[str] = None,
+) -> list[DatosSerie]:
+    """Descubre series y extrae sus datos en paralelo a través de una cola acotada.
+
+    Un hilo productor recorre las páginas de listado y encola cada serie apenas aparece;
+    `max_workers` hilos consumidores la toman de la cola y completan sus datos. Cuando la
+    cola está llena el productor espera, por lo que las series pendientes de extraer
+    nunca superan `profundidad_cola`.
+
+    Si se entrega un checkpoint, cada página y cada resultado quedan registrados en él. Al
+    reanudar, primero se encolan las series pendientes o fallidas y el listado continúa
+    desde la última página registrada; las series ya completas no se vuelven a descargar.
+
+    Si se entrega un exportador, cada serie se le entrega apenas termina su extracción (las
+    completas de una ejecución anterior, al comenzar) y el pipeline no retiene las series,
+    por lo que la memoria no crece con el tamaño del catálogo.
+
+    Args:
+        desde_pagina (Optional[int]): Primera página de listado a leer.
+        hasta_pagina (Optional[int]): Última página de listado a leer.
+        max_workers (Optional[int]): Hilos consumidores. Por defecto `settings.max_workers_detalle`.
+        profundidad_cola (Optional[int]): Tamaño máximo de la cola. Por defecto
+            `settings.profundidad_cola_detalle`.
+        checkpoint (Optional[Checkpoint]): Estado persistente del crawl para poder reanudarlo.
+        exportador (Optional[ExportadorStreaming]): Etapa de escritura que recibe las series.
+        base_url (Optional[str]): Sitio a recorrer. Por defecto `settings.base_url`.
+
+    Returns:
+        list[DatosSerie]: Series descubiertas con sus datos extraídos, en orden de aparición.
+            Con checkpoint incluye también las series procesadas en ejecuciones anteriores.
+            Con exportador la lista queda vacía: las series están en su sumidero.
+    """
+    if max_workers is None:
+        max_workers = settings.max_workers_detalle
+    if profundidad_cola is None:
+        profundidad_cola = settings.profundidad_cola_detalle
+    max_workers = max(1, max_workers)
+
+    cola: queue.Queue[Optional[DatosSerie]] = queue.Queue(maxsize=profundidad_cola)
+    descubiertas: list[DatosSerie] = []
+    cola_reintentos: list[DatosSerie] = []
+    lock_reintentos = threading.Lock()
+
+    def encolar(numero_pagina: int, series_en_pagina: list[DatosSerie]):
+        if checkpoint is not None:
+            series_en_pagina = checkpoint.registrar_pagina(numero_pagina, series_en_pagina)
+        for serie in series_en_pagina:
+            cola.put(serie)
+
+    def productor():
+        nonlocal desde_pagina
+        try:
+            if checkpoint is not None:
+                for serie in checkpoint.series_pendientes():
+                    cola.put(serie)
+                ultima_pagina = checkpoint.ultima_pagina()
+                if ultima_pagina is not None:
+                    desde_pagina = max(desde_pagina or 1, ultima_pagina + 1)
+                    logging.info(f"Se reanuda el listado desde la página {desde_pagina}.")
+
+            descubiertas.extend(
+                scraping_obtener_links_series(
+                    desde_pagina=desde_pagina,
+                    hasta_pagina=hasta_pagina,
+                    al_encontrar=encolar,
+                    acumular=exportador is None,
+                    base_url=base_url,
+                )
+            )
+        finally:
+            # Una marca de fin por consumidor
+            for _ in range(max_workers):
+                cola.put(None)
+
+    def consumidor():
+        while (serie := cola.get()) is not None:
+            try:
+                extraer_datos_de_serie(serie=serie)
+            except Exception as e:
+                logging.error(f"Error inesperado al procesar la serie {serie.link}: {e}")
+                continue
+            if serie.fecha_extraccion is None:
+                with lock_reintentos:
+                    cola_reintentos.append(serie)
+                continue
+            if checkpoint is not None:
+                checkpoint.registrar_resultado(serie)
+            if exportador is not None:
+                exportador.agregar(serie)
+            logging.debug(f"Serie procesada: {serie.link}")
+
+    metricas = obtener_metricas()
+    metricas.registrar_medidor("cola_detalle", cola.qsize)
+    metricas.registrar_medidor("series_a_reintentar", lambda: len(cola_reintentos))
+
+    if checkpoint is not None and exportador is not None:
+        for serie in checkpoint.series_completas():
+            exportador.agregar(serie)
+
+    hilos = [threading.Thread(target=productor, name="productor-listado")]
+    hilos += [
+        threading.Thread(target=consumidor, name=f"consumidor-detalle-{i}")
+        for i in range(max_workers)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    if cola_reintentos:
+        # Las series fallidas se reintentan una vez más al final, cuando el servidor ya no
+        # recibe la carga del crawl principal
+        logging.info(f"Se reintentará la extracción de {len(cola_reintentos)} series fallidas.")
+        extraer_datos_de_series(cola_reintentos, max_workers=max_workers)
+        for serie in cola_reintentos:
+            if checkpoint is not None:
+                checkpoint.registrar_resultado(serie)
+            if exportador is not None:
+                exportador.agregar(serie)
+
+    if exportador is not None:
+        return []
+    if checkpoint is not None:
+        return checkpoint.series()
+    return descubiertas
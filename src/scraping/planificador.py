@@ -0,0 +1,116 @@
+"""Control de ritmo de las peticiones: límite de tasa, concurrencia adaptativa y reintentos."""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Limitador de tasa por cubeta de fichas: permite ráfagas cortas y una tasa media fija."""
+
+    def __init__(self, tasa: float, capacidad: int):
+        """Crea la cubeta llena.
+
+        Args:
+            tasa (float): Fichas (peticiones) que se reponen por segundo.
+            capacidad (int): Máximo de fichas acumulables, es decir, el tamaño de ráfaga.
+        """
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self._fichas = float(capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self):
+        """Bloquea hasta que haya una ficha disponible y la consume."""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._fichas = min(
+                    self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa
+                )
+                self._ultimo = ahora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.tasa
+            time.sleep(espera)
+
+
+class LimiteAdaptativo:
+    """Semáforo cuyo límite de concurrencia se ajusta según la latencia y los errores (AIMD).
+
+    Cada respuesta rápida aumenta el límite en `1 / limite` (crecimiento aditivo); cada
+    error lo divide a la mitad y cada respuesta más lenta que la latencia objetivo lo reduce
+    un 10%. El límite se mantiene entre `minimo` y `maximo`.
+    """
+
+    def __init__(self, maximo: int, latencia_objetivo: float, minimo: int = 1):
+        """Crea el límite partiendo de la concurrencia máxima."""
+        self.maximo = maximo
+        self.minimo = minimo
+        self.latencia_objetivo = latencia_objetivo
+        self.limite = float(maximo)
+        self._en_uso = 0
+        self._condicion = threading.Condition()
+
+    def __enter__(self):
+        """Espera a que haya un cupo libre dentro del límite actual y lo ocupa."""
+        with self._condicion:
+            while self._en_uso >= max(self.minimo, int(self.limite)):
+                self._condicion.wait()
+            self._en_uso += 1
+        return self
+
+    def __exit__(self, *exc):
+        """Libera el cupo ocupado."""
+        with self._condicion:
+            self._en_uso -= 1
+            self._condicion.notify()
+
+    def registrar_exito(self, latencia: float):
+        """Ajusta el límite tras una respuesta correcta que tardó `latencia` segundos."""
+        with self._condicion:
+            if latencia > self.latencia_objetivo:
+                self.limite = max(self.minimo, self.limite * 0.9)
+            else:
+                self.limite = min(self.maximo, self.limite + 1 / self.limite)
+            self._condicion.notify_all()
+
+    def registrar_error(self):
+        """Reduce el límite a la mitad tras un error o una respuesta de saturación."""
+        with self._condicion:
+            self.limite = max(self.minimo, self.limite / 2)
+
+
+def calcular_espera(intento: int, base: float, maximo: float) -> float:
+    """Calcula la espera antes de un reintento con backoff exponencial y jitter completo.
+
+    Args:
+        intento (int): Número de reintento, partiendo en 0.
+        base (float): Espera base en segundos.
+        maximo (float): Espera máxima en segundos.
+
+    Returns:
+        float: Segundos a esperar, elegidos al azar entre 0 y `base * 2**intento`.
+    """
+    return random.uniform(0, min(maximo, base * 2**intento))
+
+
+def interpretar_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Convierte la cabecera `Retry-After` (segundos o fecha HTTP) en segundos de espera."""
+    if not valor:
+        return None
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,52 @@
+"""Pool de procesos compartido para parsear las páginas de detalle fuera de los hilos de red."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from const import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock_pool = threading.Lock()
+
+
+def cantidad_procesos_parseo() -> int:
+    """Devuelve los procesos de parseo a usar según `settings` (0 si no se usa el pool)."""
+    if settings.procesos_parseo is not None:
+        return max(0, settings.procesos_parseo)
+    procesos = os.cpu_count() or 1
+    # Con un solo núcleo el pool solo agrega el costo de serializar cada página
+    return procesos if procesos > 1 else 0
+
+
+def obtener_pool_parseo() -> Optional[ProcessPoolExecutor]:
+    """Devuelve el pool de parseo del proceso, creándolo la primera vez.
+
+    Los procesos se crean con `spawn` porque el pool se abre desde un hilo de descarga,
+    mientras otros hilos están activos, y hacer `fork` en ese estado no es seguro.
+
+    Returns:
+        Optional[ProcessPoolExecutor]: El pool, o None si el parseo se hace en los hilos.
+    """
+    global _pool
+    if _pool is None:
+        procesos = cantidad_procesos_parseo()
+        if procesos == 0:
+            return None
+        with _lock_pool:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=procesos, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def cerrar_pool_parseo():
+    """Termina los procesos del pool de parseo, si estaba abierto."""
+    global _pool
+    with _lock_pool:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
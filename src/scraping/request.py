@@ -1,39 +1,187 @@
 """Funciones para obtener y buscar series desde Sensacine usando requests y BeautifulSoup."""
 
-from urllib.parse import urljoin
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from cache_http import obtener_cache
 from const import settings
 from datos_serie import DatosSerie
+from parser_html import parsear_html
+from perfilado import perfilar
+from planificador import LimiteAdaptativo, TokenBucket, calcular_espera, interpretar_retry_after
+from sesion import obtener_sesion
+from telemetria import obtener_metricas
+
+# Respuestas que indican saturación o fallos transitorios del servidor
+ESTADOS_REINTENTABLES = frozenset({429, 500, 502, 503, 504})
+
+_limites_por_host: dict[str, LimiteAdaptativo] = {}
+_limitador_tasa: Optional[TokenBucket] = None
+_lock_limites = threading.Lock()
+
+
+def _limite_host(link: str) -> LimiteAdaptativo:
+    """Devuelve el límite adaptativo de conexiones simultáneas al host del enlace."""
+    host = urlparse(link).netloc
+    with _lock_limites:
+        limite = _limites_por_host.get(host)
+        if limite is None:
+            limite = LimiteAdaptativo(
+                maximo=settings.max_conexiones_por_host,
+                latencia_objetivo=settings.latencia_objetivo,
+            )
+            _limites_por_host[host] = limite
+    return limite
+
+
+def _obtener_limitador_tasa() -> Optional[TokenBucket]:
+    """Devuelve el limitador de tasa global, o None si `settings.peticiones_por_segundo` es 0."""
+    global _limitador_tasa
+    if settings.peticiones_por_segundo <= 0:
+        return None
+    with _lock_limites:
+        if _limitador_tasa is None:
+            _limitador_tasa = TokenBucket(
+                tasa=settings.peticiones_por_segundo, capacidad=settings.rafaga_peticiones
+            )
+    return _limitador_tasa
+
+
+def _descargar(link: str, cabeceras: dict[str, str]) -> requests.Response:
+    """Realiza la petición respetando el límite de tasa y reintentando los fallos transitorios.
+
+    Los errores de conexión, timeouts y respuestas en `ESTADOS_REINTENTABLES` se reintentan
+    hasta `settings.max_reintentos` veces con backoff exponencial y jitter, o esperando lo
+    indicado por `Retry-After` cuando el servidor lo envía.
 
-
-def get_soup(link: str) -> BeautifulSoup:
-    """Obtiene y parsea el contenido HTML de un enlace usando BeautifulSoup.
+    Raises:
+        requests.RequestException: Si se agotan los reintentos.
+    """
+    limite = _limite_host(link)
+    limitador_tasa = _obtener_limitador_tasa()
+    metricas = obtener_metricas()
+
+    intento = 0
+    while True:
+        if limitador_tasa is not None:
+            limitador_tasa.adquirir()
+
+        inicio = time.monotonic()
+        try:
+            with limite:
+                r = obtener_sesion().get(
+                    link,
+                    headers=cabeceras,
+                    timeout=(settings.timeout_conexion, settings.timeout_lectura),
+                )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            metricas.incrementar("peticiones_total", estado=type(e).__name__)
+            limite.registrar_error()
+            error: requests.RequestException = e
+            espera = calcular_espera(
+                intento, settings.espera_base_reintento, settings.espera_maxima_reintento
+            )
+        else:
+            duracion = time.monotonic() - inicio
+            metricas.observar("descarga_segundos", duracion)
+            metricas.incrementar("peticiones_total", estado=str(r.status_code))
+            metricas.incrementar("bytes_descargados_total", len(r.content))
+            if r.status_code not in ESTADOS_REINTENTABLES:
+                limite.registrar_exito(duracion)
+                return r
+            limite.registrar_error()
+            error = requests.HTTPError(f"{r.status_code} para la url: {link}", response=r)
+            retry_after = interpretar_retry_after(r.headers.get("Retry-After"))
+            if retry_after is not None:
+                espera = min(retry_after, settings.espera_maxima_reintento)
+            else:
+                espera = calcular_espera(
+                    intento, settings.espera_base_reintento, settings.espera_maxima_reintento
+                )
+
+        if intento >= settings.max_reintentos:
+            raise error
+        intento += 1
+        metricas.incrementar("reintentos_total")
+        logging.warning(f"Reintento {intento} de {link} en {espera:.1f}s: {error}")
+        time.sleep(espera)
+
+
+@perfilar
+def obtener_contenido(link: str) -> bytes:
+    """Descarga el contenido de un enlace, apoyándose en la caché HTTP en disco.
+
+    Si la respuesta guardada sigue vigente se devuelve sin tocar la red; si no, se revalida
+    con `If-None-Match`/`If-Modified-Since` y un 304 reutiliza el contenido guardado. Los
+    fallos transitorios se reintentan (ver `_descargar`).
 
     Args:
         link (str): URL a consultar.
 
     Returns:
-        BeautifulSoup: Objeto parseado del HTML.
+        bytes: Cuerpo de la respuesta.
 
     Raises:
         ValueError: Si ocurre un error en la petición HTTP.
     """
+    metricas = obtener_metricas()
+    cache = obtener_cache()
+    entrada = cache.obtener(link) if cache is not None else None
+    if entrada is not None and entrada.vigente(cache.ttl):
+        metricas.incrementar("cache_http_total", resultado="acierto")
+        return entrada.contenido
+
+    cabeceras = entrada.cabeceras_condicionales() if entrada is not None else {}
     try:
-        r = requests.get(link)
+        r = _descargar(link, cabeceras)
         r.raise_for_status()
     except requests.RequestException as e:
         raise ValueError(f"Error al realizar el request: {e}")
 
-    return BeautifulSoup(r.content, "html.parser")
+    if cache is not None:
+        if r.status_code == 304 and entrada is not None:
+            metricas.incrementar("cache_http_total", resultado="revalidado")
+            cache.renovar(link)
+            return entrada.contenido
+        metricas.incrementar("cache_http_total", resultado="fallo")
+        cache.guardar(link, r.content, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    return r.content
+
+
+@perfilar
+def get_soup(link: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Obtiene y parsea el contenido HTML de un enlace usando BeautifulSoup.
+
+    El contenido se obtiene con `obtener_contenido`, que reutiliza conexiones y respuestas
+    guardadas en caché.
+
+    Args:
+        link (str): URL a consultar.
+        parse_only (Optional[SoupStrainer]): Si se indica, solo se construyen los subárboles
+            que cumplen el filtro.
+
+    Returns:
+        BeautifulSoup: Objeto parseado del HTML.
+
+    Raises:
+        ValueError: Si ocurre un error en la petición HTTP.
+    """
+    return parsear_html(obtener_contenido(link), parse_only=parse_only)
 
 
-def buscar_links_de_series(soup: BeautifulSoup) -> list[DatosSerie]:
+@perfilar
+def buscar_links_de_series(soup: BeautifulSoup, base_url: Optional[str] = None) -> list[DatosSerie]:
     """Busca y retorna los links y títulos de series en el HTML dado.
 
     Args:
         soup (BeautifulSoup): HTML parseado de la página principal.
+        base_url (Optional[str]): URL contra la que se resuelven los links relativos. Por
+            defecto `settings.base_url`.
 
     Returns:
         list[DatosSerie]: Lista de objetos DatosSerie con link y título.
@@ -41,6 +189,8 @@ def buscar_links_de_series(soup: BeautifulSoup) -> list[DatosSerie]:
     # Busca los contenedores de películas.
     peliculas = soup.find_all("li", class_="mdl")
 
+    if base_url is None:
+        base_url = settings.base_url
     datos_serie = []
 
     for peli in peliculas:
@@ -49,7 +199,7 @@ def buscar_links_de_series(soup: BeautifulSoup) -> list[DatosSerie]:
         if link:
             titulo = link.get_text(strip=True)
             href = link["href"]
-            url_completa = urljoin(settings.base_url, href)
+            url_completa = urljoin(base_url, href)
             datos_serie.append(DatosSerie(link=url_completa, titulo=titulo))
 
     return datos_serie
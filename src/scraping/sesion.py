@@ -0,0 +1,53 @@
+"""Sesión HTTP compartida con pool de conexiones keep-alive para el scraping de series."""
+
+import threading
+from typing import Optional
+
+import requests
+from const import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+_sesion: Optional[requests.Session] = None
+_lock_sesion = threading.Lock()
+
+
+def crear_sesion() -> requests.Session:
+    """Crea una sesión con pool de conexiones reutilizables y compresión negociada.
+
+    El pool mantiene las conexiones abiertas (keep-alive) entre peticiones al mismo host,
+    evitando repetir el handshake TCP/TLS en cada página. La cabecera `Accept-Encoding`
+    incluye `br` solo si urllib3 puede decodificar brotli en este entorno.
+
+    Returns:
+        requests.Session: Sesión configurada según `settings`.
+    """
+    sesion = requests.Session()
+    adaptador = HTTPAdapter(
+        pool_connections=settings.pools_por_host,
+        pool_maxsize=settings.tamano_pool_conexiones,
+        pool_block=True,
+    )
+    sesion.mount("http://", adaptador)
+    sesion.mount("https://", adaptador)
+    sesion.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    return sesion
+
+
+def obtener_sesion() -> requests.Session:
+    """Devuelve la sesión compartida del proceso, creándola la primera vez."""
+    global _sesion
+    if _sesion is None:
+        with _lock_sesion:
+            if _sesion is None:
+                _sesion = crear_sesion()
+    return _sesion
+
+
+def cerrar_sesion():
+    """Cierra la sesión compartida y libera las conexiones del pool."""
+    global _sesion
+    with _lock_sesion:
+        if _sesion is not None:
+            _sesion.close()
+            _sesion = None
@@ -0,0 +1,335 @@
+"""Métricas del crawl: contadores, histogramas de latencia y profundidad de colas.
+
+Las métricas se exponen en formato de texto de Prometheus (`/metrics`) y/o como instantáneas
+JSON periódicas. Con `settings.telemetria` en False todas las llamadas van a un objeto que no
+hace nada, por lo que instrumentar el código casi no tiene costo.
+"""
+
+import bisect
+import contextlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator, Optional
+
+from const import settings
+
+# Límites superiores (en segundos) de los buckets de los histogramas de latencia
+BUCKETS_LATENCIA = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+PERCENTILES = (50, 95, 99)
+PREFIJO = "scraping_"
+
+Etiquetas = tuple[tuple[str, str], ...]
+
+
+class Histograma:
+    """Histograma acumulativo de buckets fijos, con percentiles aproximados."""
+
+    def __init__(self, limites: tuple[float, ...] = BUCKETS_LATENCIA):
+        """Crea un histograma vacío con los límites de bucket indicados."""
+        self.limites = limites
+        self.cuentas = [0] * len(limites)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        """Registra un valor."""
+        self.cuentas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Estima el percentil `p` interpolando linealmente dentro de su bucket."""
+        if not self.total:
+            return None
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for i, cuenta in enumerate(self.cuentas):
+            if acumulado + cuenta >= objetivo and cuenta:
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                superior = self.limites[i]
+                if math.isinf(superior):
+                    return inferior
+                return inferior + (superior - inferior) * (objetivo - acumulado) / cuenta
+            acumulado += cuenta
+        return None
+
+
+class Metricas:
+    """Registro de métricas compartido por todos los hilos del proceso."""
+
+    def __init__(self):
+        """Crea un registro vacío; el tiempo de inicio sirve para calcular las tasas."""
+        self.inicio = time.time()
+        self._lock = threading.Lock()
+        self._contadores: dict[tuple[str, Etiquetas], float] = {}
+        self._histogramas: dict[tuple[str, Etiquetas], Histograma] = {}
+        self._medidores: dict[str, Callable[[], float]] = {}
+
+    def incrementar(self, nombre: str, valor: float = 1, **etiquetas: str):
+        """Suma `valor` al contador `nombre` con las etiquetas dadas."""
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+
+    def observar(self, nombre: str, valor: float, **etiquetas: str):
+        """Registra un valor (p. ej. una duración en segundos) en el histograma `nombre`."""
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = Histograma()
+            histograma.observar(valor)
+
+    @contextlib.contextmanager
+    def cronometrar(self, nombre: str, **etiquetas: str) -> Iterator[None]:
+        """Registra en el histograma `nombre` la duración del bloque `with`."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nombre, time.perf_counter() - inicio, **etiquetas)
+
+    def registrar_medidor(self, nombre: str, funcion: Callable[[], float]):
+        """Registra un valor instantáneo (p. ej. el tamaño de una cola) que se lee al exportar."""
+        with self._lock:
+            self._medidores[nombre] = funcion
+
+    def contador(self, nombre: str, **etiquetas: str) -> float:
+        """Devuelve el valor actual de un contador, sumando todas sus etiquetas si no se indican."""
+        with self._lock:
+            if etiquetas:
+                return self._contadores.get((nombre, tuple(sorted(etiquetas.items()))), 0)
+            return sum(v for (n, _), v in self._contadores.items() if n == nombre)
+
+    def instantanea(self) -> dict:
+        """Devuelve todas las métricas, y algunas derivadas, en un diccionario serializable."""
+        duracion = max(time.time() - self.inicio, 1e-9)
+        with self._lock:
+            contadores = [
+                {"nombre": n, "etiquetas": dict(e), "valor": v}
+                for (n, e), v in sorted(self._contadores.items())
+            ]
+            histogramas = [
+                {
+                    "nombre": n,
+                    "etiquetas": dict(e),
+                    "total": h.total,
+                    "suma": h.suma,
+                    **{f"p{p}": h.percentil(p) for p in PERCENTILES},
+                }
+                for (n, e), h in sorted(self._histogramas.items())
+            ]
+            medidores = dict(self._medidores)
+
+        peticiones = self.contador("peticiones_total")
+        aciertos = self.contador("cache_http_total", resultado="acierto") + self.contador(
+            "cache_http_total", resultado="revalidado"
+        )
+        consultas_cache = self.contador("cache_http_total")
+        return {
+            "timestamp": time.time(),
+            "segundos": duracion,
+            "peticiones_por_segundo": peticiones / duracion,
+            "bytes_descargados": self.contador("bytes_descargados_total"),
+            "tasa_aciertos_cache": aciertos / consultas_cache if consultas_cache else None,
+            "contadores": contadores,
+            "histogramas": histogramas,
+            "medidores": {nombre: _leer_medidor(f) for nombre, f in medidores.items()},
+        }
+
+    def formato_prometheus(self) -> str:
+        """Devuelve las métricas en el formato de texto de exposición de Prometheus."""
+        lineas: list[str] = []
+        with self._lock:
+            tipos_vistos: set[str] = set()
+            for (nombre, etiquetas), valor in sorted(self._contadores.items()):
+                nombre = PREFIJO + nombre
+                if nombre not in tipos_vistos:
+                    lineas.append(f"# TYPE {nombre} counter")
+                    tipos_vistos.add(nombre)
+                lineas.append(f"{nombre}{_etiquetas_prometheus(etiquetas)} {valor:g}")
+            for (nombre, etiquetas), h in sorted(self._histogramas.items()):
+                nombre = PREFIJO + nombre
+                if nombre not in tipos_vistos:
+                    lineas.append(f"# TYPE {nombre} histogram")
+                    tipos_vistos.add(nombre)
+                acumulado = 0
+                for limite, cuenta in zip(h.limites, h.cuentas):
+                    acumulado += cuenta
+                    le = "+Inf" if math.isinf(limite) else f"{limite:g}"
+                    lineas.append(
+                        f"{nombre}_bucket{_etiquetas_prometheus(etiquetas + (('le', le),))} "
+                        f"{acumulado}"
+                    )
+                lineas.append(f"{nombre}_sum{_etiquetas_prometheus(etiquetas)} {h.suma:g}")
+                lineas.append(f"{nombre}_count{_etiquetas_prometheus(etiquetas)} {h.total}")
+            medidores = dict(self._medidores)
+        for nombre, funcion in sorted(medidores.items()):
+            lineas.append(f"# TYPE {PREFIJO}{nombre} gauge")
+            lineas.append(f"{PREFIJO}{nombre} {_leer_medidor(funcion):g}")
+        return "\n".join(lineas) + "\n"
+
+
+class MetricasDesactivadas:
+    """Misma interfaz que `Metricas`, sin registrar nada. Se usa con la telemetría apagada."""
+
+    inicio = 0.0
+
+    def incrementar(self, nombre: str, valor: float = 1, **etiquetas: str):
+        """No hace nada."""
+
+    def observar(self, nombre: str, valor: float, **etiquetas: str):
+        """No hace nada."""
+
+    def cronometrar(self, nombre: str, **etiquetas: str) -> contextlib.nullcontext:
+        """Devuelve un contexto vacío."""
+        return _CONTEXTO_VACIO
+
+    def registrar_medidor(self, nombre: str, funcion: Callable[[], float]):
+        """No hace nada."""
+
+    def contador(self, nombre: str, **etiquetas: str) -> float:
+        """Siempre 0."""
+        return 0
+
+    def instantanea(self) -> dict:
+        """Siempre vacía."""
+        return {}
+
+    def formato_prometheus(self) -> str:
+        """Siempre vacío."""
+        return ""
+
+
+_CONTEXTO_VACIO = contextlib.nullcontext()
+
+
+def _leer_medidor(funcion: Callable[[], float]) -> float:
+    try:
+        return float(funcion())
+    except Exception:
+        return math.nan
+
+
+def _etiquetas_prometheus(etiquetas: Etiquetas) -> str:
+    if not etiquetas:
+        return ""
+    pares = ",".join(f'{clave}="{valor}"' for clave, valor in etiquetas)
+    return "{" + pares + "}"
+
+
+_metricas: Optional[Metricas | MetricasDesactivadas] = None
+_lock_metricas = threading.Lock()
+_servidor: Optional[ThreadingHTTPServer] = None
+_detener_instantaneas = threading.Event()
+_hilo_instantaneas: Optional[threading.Thread] = None
+
+
+def obtener_metricas() -> Metricas | MetricasDesactivadas:
+    """Devuelve el registro de métricas del proceso (inactivo si `settings.telemetria` es False)."""
+    global _metricas
+    if _metricas is None:
+        with _lock_metricas:
+            if _metricas is None:
+                _metricas = Metricas() if settings.telemetria else MetricasDesactivadas()
+    return _metricas
+
+
+def telemetria_activa() -> bool:
+    """Indica si las métricas se están registrando."""
+    return isinstance(obtener_metricas(), Metricas)
+
+
+def escribir_instantanea(ruta: str):
+    """Escribe la instantánea JSON actual de forma atómica."""
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(obtener_metricas().instantanea(), f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    """Responde `/metrics` con el formato de texto de Prometheus."""
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        contenido = obtener_metricas().formato_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_telemetria():
+    """Inicia los exportadores configurados: endpoint Prometheus e instantáneas JSON."""
+    global _servidor, _hilo_instantaneas
+    if not telemetria_activa():
+        return
+
+    if settings.puerto_metricas and _servidor is None:
+        _servidor = ThreadingHTTPServer(("", settings.puerto_metricas), _ManejadorMetricas)
+        threading.Thread(target=_servidor.serve_forever, name="metricas", daemon=True).start()
+        logging.info(f"Métricas en http://localhost:{settings.puerto_metricas}/metrics")
+
+    if settings.archivo_metricas and _hilo_instantaneas is None:
+        _detener_instantaneas.clear()
+
+        def instantaneas():
+            while not _detener_instantaneas.wait(settings.intervalo_metricas):
+                escribir_instantanea(settings.archivo_metricas)
+
+        _hilo_instantaneas = threading.Thread(target=instantaneas, name="instantaneas", daemon=True)
+        _hilo_instantaneas.start()
+
+
+def detener_telemetria():
+    """Detiene los exportadores, escribe la última instantánea y resume el crawl en el log."""
+    global _servidor, _hilo_instantaneas
+    if not telemetria_activa():
+        return
+
+    if _hilo_instantaneas is not None:
+        _detener_instantaneas.set()
+        _hilo_instantaneas.join()
+        _hilo_instantaneas = None
+    if settings.archivo_metricas:
+        escribir_instantanea(settings.archivo_metricas)
+    if _servidor is not None:
+        _servidor.shutdown()
+        _servidor.server_close()
+        _servidor = None
+
+    resumen = obtener_metricas().instantanea()
+    logging.info(
+        f"Telemetría: {resumen['peticiones_por_segundo']:.1f} peticiones/s, "
+        f"{resumen['bytes_descargados'] / 2**20:.1f} MiB descargados, "
+        f"aciertos de caché {resumen['tasa_aciertos_cache'] or 0:.0%}"
+    )